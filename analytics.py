@@ -0,0 +1,214 @@
+"""Aggregate PhysiBreak telemetry logs into classroom summary tables.
+
+    python analytics.py telemetry/ [more dirs or files] --out reports --workers 4
+
+Each log file is stream-parsed line by line and reduced to a small partial
+summary in a worker process; partials are merged as they arrive, so memory
+depends on the number of questions and sessions, never on log size.
+Response-time percentiles come from fixed log-spaced histograms, which merge
+exactly across files.
+
+Writes question_stats.csv, lesson_mastery.csv and level_survival.csv.
+"""
+import argparse
+import csv
+import gzip
+import json
+import math
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+RT_MIN = 0.1     # seconds; response-time histogram range
+RT_MAX = 600.0
+RT_BUCKETS = 120
+_RT_SCALE = RT_BUCKETS / math.log(RT_MAX / RT_MIN)
+
+MASTERY_ACCURACY = 0.8  # a question counts as mastered at this accuracy ...
+MASTERY_ATTEMPTS = 3    # ... over at least this many answers
+
+
+def iter_log_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith('.jsonl') or name.endswith('.jsonl.gz'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def iter_events(path, damaged=None):
+    """Events in one log file. A file that breaks off (a crashed session's unfinished
+    gzip member, a disk error) yields what was read before the break and is noted in `damaged`."""
+    opener = gzip.open if path.endswith('.gz') else open
+    try:
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # a truncated last line from a crashed session
+    except (EOFError, OSError, UnicodeDecodeError, zlib.error) as e:
+        print(f'{path}: truncated ({e.__class__.__name__}: {e})', file=sys.stderr)
+        if damaged is not None:
+            damaged.append(path)
+
+
+def rt_bucket(seconds):
+    if seconds <= RT_MIN:
+        return 0
+    return min(RT_BUCKETS - 1, int(math.log(seconds / RT_MIN) * _RT_SCALE))
+
+
+def rt_bucket_upper(index):
+    return RT_MIN * math.exp((index + 1) / _RT_SCALE)
+
+
+def percentile(hist, fraction):
+    total = sum(hist)
+    if not total:
+        return None
+    target = fraction * total
+    running = 0
+    for i, n in enumerate(hist):
+        running += n
+        if running >= target:
+            return rt_bucket_upper(i)
+    return RT_MAX
+
+
+def summarize_file(path):
+    """Reduce one log file to {'questions': {qid: [attempts, correct, hist]}, 'sessions': {id: max_level},
+    'truncated': 0 or 1}."""
+    questions = {}
+    sessions = {}
+    damaged = []
+    for ev in iter_events(path, damaged):
+        kind = ev.get('event')
+        session = ev.get('session')
+        level = ev.get('level')
+        if kind == 'level_cleared' and level is not None:
+            level += 1  # clearing level n means the session reached n + 1
+        if session is not None:
+            if level is not None and level > sessions.get(session, 0):
+                sessions[session] = level
+            elif session not in sessions:
+                sessions[session] = 1
+        if kind == 'question_answered':
+            stats = questions.get(ev['qid'])
+            if stats is None:
+                stats = questions[ev['qid']] = [0, 0, [0] * RT_BUCKETS]
+            stats[0] += 1
+            stats[1] += 1 if ev.get('correct') else 0
+            if ev.get('response_time') is not None:
+                stats[2][rt_bucket(ev['response_time'])] += 1
+    return {'questions': questions, 'sessions': sessions, 'truncated': len(damaged)}
+
+
+def merge(total, part):
+    for qid, (attempts, correct, hist) in part['questions'].items():
+        stats = total['questions'].get(qid)
+        if stats is None:
+            total['questions'][qid] = [attempts, correct, hist]
+            continue
+        stats[0] += attempts
+        stats[1] += correct
+        stats[2] = [a + b for a, b in zip(stats[2], hist)]
+    sessions = total['sessions']
+    for session, level in part['sessions'].items():
+        if level > sessions.get(session, 0):
+            sessions[session] = level
+    total['truncated'] += part['truncated']
+    return total
+
+
+def aggregate(paths, workers=None):
+    total = {'questions': {}, 'sessions': {}, 'truncated': 0}
+    files = iter_log_files(paths)
+    if workers == 1:
+        for path in files:
+            merge(total, summarize_file(path))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(summarize_file, files, chunksize=8):
+            merge(total, part)
+    return total
+
+
+def load_content():
+    """Question prompts and lesson titles, keyed the same way the game logs them."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from game import QuestionManager
+    qman = QuestionManager()
+    return qman
+
+
+def _fmt(value, digits=3):
+    return '' if value is None else round(value, digits)
+
+
+def write_reports(total, qman, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    by_lesson = {title: [0, 0, 0, 0] for title, _ in qman.lesson_sizes}  # questions, attempts, correct, mastered
+
+    with open(os.path.join(out_dir, 'question_stats.csv'), 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(['question_id', 'lesson', 'prompt', 'attempts', 'correct', 'accuracy',
+                    'rt_p50', 'rt_p90', 'rt_p95'])
+        for qid in sorted(total['questions']):
+            attempts, correct, hist = total['questions'][qid]
+            known = isinstance(qid, int) and 0 <= qid < len(qman.questions) and qman.questions[qid] is not None
+            lesson = qman.lesson_for(qid) if known else ''
+            prompt = qman.questions[qid][0] if known else ''
+            accuracy = correct / attempts if attempts else None
+            w.writerow([qid, lesson, prompt, attempts, correct, _fmt(accuracy),
+                        _fmt(percentile(hist, 0.5), 2), _fmt(percentile(hist, 0.9), 2),
+                        _fmt(percentile(hist, 0.95), 2)])
+            if lesson in by_lesson:  # not a question since deleted from the bank
+                row = by_lesson[lesson]
+                row[0] += 1
+                row[1] += attempts
+                row[2] += correct
+                if attempts >= MASTERY_ATTEMPTS and accuracy >= MASTERY_ACCURACY:
+                    row[3] += 1
+
+    with open(os.path.join(out_dir, 'lesson_mastery.csv'), 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(['lesson', 'questions_in_bank', 'questions_seen', 'attempts', 'accuracy',
+                    'questions_mastered', 'mastery'])
+        for title, size in qman.lesson_sizes:
+            seen, attempts, correct, mastered = by_lesson[title]
+            w.writerow([title, size, seen, attempts, _fmt(correct / attempts if attempts else None),
+                        mastered, _fmt(mastered / size)])
+
+    levels = list(total['sessions'].values())
+    with open(os.path.join(out_dir, 'level_survival.csv'), 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(['level', 'sessions_reaching', 'fraction'])
+        for level in range(1, max(levels, default=0) + 1):
+            reaching = sum(1 for lv in levels if lv >= level)
+            w.writerow([level, reaching, _fmt(reaching / len(levels))])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Summarize PhysiBreak telemetry logs.')
+    parser.add_argument('paths', nargs='+', help='log files or directories of *.jsonl(.gz)')
+    parser.add_argument('--out', default='reports', help='directory for the CSV tables')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size (1 = in-process)')
+    args = parser.parse_args(argv)
+
+    total = aggregate(args.paths, args.workers)
+    write_reports(total, load_content(), args.out)
+    truncated = f", {total['truncated']} truncated files" if total['truncated'] else ''
+    print(f"{len(total['sessions'])} sessions, {len(total['questions'])} questions{truncated} -> {args.out}/")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
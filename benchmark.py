@@ -0,0 +1,69 @@
+"""Setup shared by the modules' --bench runs.
+
+A benchmark plays real PhysiBreakGames under the dummy SDL drivers, with a
+progress store and telemetry logs in a scratch directory that is removed
+when the run ends, however it ends:
+
+    with bench_game('display') as game:          # one game
+        ...
+    with bench_games('gc') as games:              # several, sharing one progress store
+        game = games.game(log='managed', gc_mode='managed')
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+import warnings
+
+
+class BenchGames:
+    def __init__(self, name):
+        from progress import ProgressStore
+
+        self.dir = tempfile.mkdtemp(prefix=f'physibreak-{name}-')
+        self.progress = ProgressStore(os.path.join(self.dir, 'bench.db'))
+        self._telemetry = []
+        self._windowed = False  # a game with a window was made
+
+    def telemetry(self, log=None):
+        """A Telemetry that writes under the scratch directory in `log`, or nowhere without one."""
+        from telemetry import Telemetry
+
+        telemetry = Telemetry(directory=os.path.join(self.dir, log) if log else None)
+        self._telemetry.append(telemetry)
+        return telemetry
+
+    def game(self, log=None, **kwargs):
+        import pygame
+        from game import PhysiBreakGame
+
+        if not kwargs.get('headless'):
+            if self._windowed:
+                pygame.display.quit()  # SDL will not put a second SCALED renderer on a window
+                pygame.display.init()
+            self._windowed = True
+        return PhysiBreakGame(progress=self.progress, telemetry=self.telemetry(log), **kwargs)
+
+    def close(self):
+        for telemetry in self._telemetry:
+            telemetry.close()
+        self.progress.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def bench_games(name):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    warnings.simplefilter('ignore')  # 'no fast renderer available' under the dummy driver
+    games = BenchGames(name)
+    try:
+        yield games
+    finally:
+        games.close()
+
+
+@contextlib.contextmanager
+def bench_game(name, log=None, **kwargs):
+    with bench_games(name) as games:
+        yield games.game(log, **kwargs)
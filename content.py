@@ -0,0 +1,224 @@
+"""Question bank and lesson pages as files that can be edited while the game runs.
+
+content/questions.jsonl holds one question per line:
+
+    {"id": 0, "lesson": "...", "prompt": "...", "choices": ["...", "..."], "answer": 1, "explanation": "..."}
+
+`id` is what the game, the review scheduler, progress.db and the question
+blocks on the field refer to, so it stays with the question and is never
+reused: a new question takes the next free id, and deleting a line retires
+its id instead of renumbering the rest. Blocks already carrying a retired
+question still open it for the rest of the run; the scheduler stops handing
+it out.
+
+content/lessons.txt holds the lesson pages, each a `# Title` line followed
+by one line per bullet; blank lines are ignored.
+
+Each file remembers the text of every item it parsed, keyed by that text,
+so a reread parses only the items that changed and reports just those.
+ContentWatcher polls the files' mtime and size on a background thread and
+does the rereading there too; the game applies the queued changes between
+frames (PhysiBreakGame.apply_content) and drops the cached layout of exactly
+the questions and pages that changed. A file that does not parse (an editor
+saving half a line) is reported and skipped; the game keeps what it had.
+
+    python content.py --check              # parse both files and report problems
+    python content.py --bench              # full parse vs reread after editing one item, per file
+"""
+import collections
+import json
+import os
+import sys
+import threading
+import time
+
+QUESTIONS_PATH = os.path.join('content', 'questions.jsonl')
+LESSONS_PATH = os.path.join('content', 'lessons.txt')
+WATCH_INTERVAL = 0.5  # s between looks at the files
+
+
+class ContentError(ValueError):
+    pass
+
+
+def parse_question(line, lineno):
+    """(id, lesson, (prompt, choices, answer, explanation)) from one JSON line."""
+    try:
+        item = json.loads(line)
+        qid, lesson, prompt = item['id'], item['lesson'], item['prompt']
+        choices, answer, explanation = item['choices'], item['answer'], item.get('explanation', '')
+    except (ValueError, KeyError, TypeError) as e:
+        raise ContentError(f'line {lineno}: {e}') from None
+    if not isinstance(qid, int) or qid < 0:
+        raise ContentError(f'line {lineno}: id must be a non-negative integer')
+    if not isinstance(choices, list) or len(choices) < 2 or not all(isinstance(c, str) for c in choices):
+        raise ContentError(f'line {lineno}: choices must be a list of at least two strings')
+    if not isinstance(answer, int) or not 0 <= answer < len(choices):
+        raise ContentError(f'line {lineno}: answer must index into choices')
+    return qid, lesson, (prompt, choices, answer, explanation)
+
+
+class QuestionFile:
+    """questions.jsonl as last read."""
+    def __init__(self, path=QUESTIONS_PATH):
+        self.path = path
+        self.stamp = None  # (mtime_ns, size) of the version read
+        self._parsed = {}  # line text -> parse_question() result
+        self.items = {}  # id -> (lesson, question)
+
+    def read(self):
+        """Reread the file; (changed {id: (lesson, question)}, removed ids). Raises ContentError."""
+        stamp = _stamp(self.path)
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        parsed, items = {}, {}
+        for lineno, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            result = self._parsed.get(line) or parse_question(line, lineno)
+            qid = result[0]
+            if qid in items:
+                raise ContentError(f'line {lineno}: id {qid} is used twice')
+            parsed[line] = result
+            items[qid] = result[1:]
+        if not items:
+            raise ContentError('no questions')
+        changed = {qid: item for qid, item in items.items() if self.items.get(qid) != item}
+        removed = self.items.keys() - items.keys()
+        self._parsed, self.items, self.stamp = parsed, items, stamp
+        return changed, removed
+
+
+class LessonFile:
+    """lessons.txt as last read: pages by position."""
+    def __init__(self, path=LESSONS_PATH):
+        self.path = path
+        self.stamp = None
+        self._parsed = {}  # page text -> (title, lines)
+        self.pages = []  # (title, lines)
+
+    def read(self):
+        """Reread the file; (changed {index: (title, lines)}, page count). Raises ContentError."""
+        stamp = _stamp(self.path)
+        with open(self.path, encoding='utf-8') as f:
+            text = f.read()
+        sections = []
+        for lineno, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if line.startswith('#'):
+                sections.append([line])
+            elif line:
+                if not sections:
+                    raise ContentError(f'line {lineno}: text before the first "# Title" line')
+                sections[-1].append(line)
+        parsed, pages = {}, []
+        for section in sections:
+            key = '\n'.join(section)
+            page = self._parsed.get(key)
+            if page is None:
+                page = (section[0].lstrip('#').strip(), section[1:])
+            parsed[key] = page
+            pages.append(page)
+        if not pages:
+            raise ContentError('no lesson pages')
+        changed = {i: page for i, page in enumerate(pages) if i >= len(self.pages) or self.pages[i] != page}
+        self._parsed, self.pages, self.stamp = parsed, pages, stamp
+        return changed, len(pages)
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class ContentWatcher(threading.Thread):
+    """Polls content files and rereads the ones that changed; take() hands the results over."""
+    def __init__(self, files, interval=WATCH_INTERVAL):
+        super().__init__(name='physibreak-content', daemon=True)
+        self.files = files  # already read once; from now on only this thread reads them
+        self.interval = interval
+        self.changes = collections.deque()  # (file, result); appended here, popped by the game
+        self.errors = collections.deque(maxlen=20)
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            for content in self.files:
+                try:
+                    if _stamp(content.path) == content.stamp:
+                        continue
+                    self.changes.append((content, content.read()))
+                except (OSError, UnicodeDecodeError, ContentError) as e:
+                    # mid-save or a typo: say so once per version and keep the old content
+                    try:
+                        content.stamp = _stamp(content.path)
+                    except OSError:
+                        pass
+                    self.errors.append(f'{content.path}: {e}')
+                    print(f'content: {content.path}: {e}', file=sys.stderr)
+
+    def take(self):
+        changes = []
+        while self.changes:
+            changes.append(self.changes.popleft())
+        return changes
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def check():
+    ok = True
+    for content in (QuestionFile(), LessonFile()):
+        try:
+            changed, _ = content.read()
+            print(f'{content.path}: {len(changed)} items')
+        except (OSError, ContentError) as e:
+            print(f'{content.path}: {e}')
+            ok = False
+    return ok
+
+
+def bench(rounds=50):
+    import shutil
+    import tempfile
+
+    tmp = tempfile.mkdtemp(prefix='physibreak-content-')
+    try:
+        for cls, path in ((QuestionFile, QUESTIONS_PATH), (LessonFile, LESSONS_PATH)):
+            copy = os.path.join(tmp, os.path.basename(path))
+            shutil.copy(path, copy)
+            with open(copy, encoding='utf-8') as f:
+                text = f.read()
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                cls(copy).read()
+            full = (time.perf_counter() - t0) / rounds
+            content = cls(copy)
+            content.read()
+            spent = 0.0
+            for i in range(rounds):
+                # edit one item: the last line gets a different ending each round
+                head, last = text.rstrip('\n').rsplit('\n', 1)
+                edited = last.replace('"}', f' ({i})"}}') if last.endswith('"}') else f'{last} ({i})'
+                with open(copy, 'w', encoding='utf-8') as f:
+                    f.write(f'{head}\n{edited}\n')
+                t0 = time.perf_counter()
+                changed, _ = content.read()
+                spent += time.perf_counter() - t0
+                assert len(changed) == 1, changed
+            print(f'{os.path.basename(path):>16}: full parse {full * 1e3:.2f} ms, '
+                  f'reread after one edit {spent / rounds * 1e3:.2f} ms')
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    elif '--check' in sys.argv:
+        sys.exit(0 if check() else 1)
+    else:
+        print(__doc__)
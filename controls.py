@@ -0,0 +1,237 @@
+"""Player input: event filtering, timestamped samples and paddle control.
+
+allow_events() lets only the event types the game handles through
+pygame.event.set_allowed(), so SDL drops window, text-input, touch and audio
+events before they reach the queue. handle_events() feeds what is left to
+Controls as samples stamped with the time of the pump that read them: mouse
+motion is reduced to the last position (a flood of MOUSEMOTION never reaches
+the per-state handlers), the arrow keys and the first gamepad's stick or
+d-pad become a paddle velocity, and that pad's first four buttons answer
+questions like the A-D keys; other pads are ignored. Whichever device moved
+last steers the paddle, and Paddle.update() eases toward its target with
+that device's SMOOTHING factor (1.0 follows exactly).
+
+SDL events carry no timestamp pygame exposes, so samples are stamped with
+the pump time; an event posted with an `at` attribute (a perf_counter time,
+as synthetic input does) keeps that instead. Each sample that starts a
+movement is timed until the tick in which the paddle actually moved;
+stats() summarizes that input-to-paddle latency.
+
+    python controls.py --bench     # input-to-paddle latency per device and handle_events() cost under a motion flood
+"""
+import collections
+import random
+import statistics
+import sys
+import threading
+import time
+
+import pygame
+
+ALLOWED_EVENTS = ('QUIT', 'KEYDOWN', 'KEYUP', 'MOUSEMOTION', 'MOUSEBUTTONDOWN',
+                  'JOYAXISMOTION', 'JOYHATMOTION', 'JOYBUTTONDOWN', 'JOYDEVICEADDED', 'JOYDEVICEREMOVED',
+                  'VIDEORESIZE')
+INPUT_EVENTS = frozenset((pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN,
+                          pygame.JOYAXISMOTION, pygame.JOYHATMOTION, pygame.JOYBUTTONDOWN))
+PAD_EVENTS = frozenset((pygame.JOYAXISMOTION, pygame.JOYHATMOTION, pygame.JOYBUTTONDOWN))
+
+SMOOTHING = {'mouse': 0.35, 'keys': 0.5, 'pad': 0.5}  # share of the remaining distance covered per tick
+KEY_SPEED = 900.0  # px/s the paddle target moves while an arrow key is held
+PAD_SPEED = 900.0  # px/s at full stick deflection or d-pad
+DEADZONE = 0.2
+MOVE_EPSILON = 0.5  # px of travel that counts as the paddle having moved
+STALE = 0.25  # s; a sample the paddle never moved for (already there, against a wall) stops being timed
+KEY_DIRECTIONS = {pygame.K_LEFT: -1, pygame.K_RIGHT: 1}
+
+
+def allow_events():
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([getattr(pygame, name) for name in ALLOWED_EVENTS])
+
+
+class Controls:
+    def __init__(self, smoothing=None):
+        self.smoothing = dict(SMOOTHING if smoothing is None else smoothing)
+        self.source = 'mouse'  # device that moved last: 'mouse', 'keys' or 'pad'
+        self.mouse_x = None
+        self.left = False
+        self.right = False
+        self.axis = 0.0
+        self.hat = 0
+        self.pad = None  # instance id of the gamepad that plays: the first one opened
+        self.x = None  # paddle target while a key or the pad steers; None starts from the paddle
+        self.pending = None  # time of the first sample the paddle has not moved for yet
+        self.latency = collections.deque(maxlen=600)
+
+    def sample(self, source, at):
+        if source != self.source:
+            self.source = source
+            self.x = None
+        if self.pending is None:
+            self.pending = at
+
+    def pad_added(self, instance_id):
+        if self.pad is None:
+            self.pad = instance_id
+
+    def pad_removed(self, instance_id, remaining):
+        """`remaining`: instance ids of the pads still open."""
+        if instance_id == self.pad:
+            # the earliest opened of the rest takes over (SDL numbers devices in the order they appear)
+            self.pad = min(remaining, default=None)
+            self.axis = 0.0
+            self.hat = 0
+
+    def mouse_moved(self, event, now):
+        self.mouse_x = event.pos[0]
+        self.sample('mouse', getattr(event, 'at', now))
+
+    def feed(self, event, now):
+        """Take a paddle sample from `event`; True if no other handler needs to see it."""
+        kind = event.type
+        if kind in PAD_EVENTS and event.instance_id != self.pad:
+            return True  # a second pad plays no part
+        at = getattr(event, 'at', now)
+        if kind == pygame.KEYDOWN or kind == pygame.KEYUP:
+            direction = KEY_DIRECTIONS.get(event.key)
+            if direction is None:
+                return False
+            down = kind == pygame.KEYDOWN
+            if direction < 0:
+                self.left = down
+            else:
+                self.right = down
+            if down:
+                self.sample('keys', at)
+            return not down  # presses still reach the menus: LEFT/RIGHT also turn lesson pages
+        if kind == pygame.JOYAXISMOTION:
+            if event.axis == 0:
+                was_still = abs(self.axis) <= DEADZONE
+                self.axis = event.value
+                if abs(event.value) > DEADZONE:
+                    if was_still:
+                        self.sample('pad', at)
+                    else:
+                        self.source = 'pad'
+            return True
+        if kind == pygame.JOYHATMOTION:
+            self.hat = event.value[0]
+            if self.hat:
+                self.sample('pad', at)
+            return True
+        return False
+
+    def target(self, current, dt, width):
+        """x the paddle should head for this tick; `current` is where it is now."""
+        if self.source == 'mouse':
+            return current if self.mouse_x is None else self.mouse_x
+        if self.source == 'keys':
+            speed = (self.right - self.left) * KEY_SPEED
+        else:
+            speed = (self.hat or (self.axis if abs(self.axis) > DEADZONE else 0.0)) * PAD_SPEED
+        x = current if self.x is None else self.x
+        self.x = max(0.0, min(width, x + speed * dt))
+        return self.x
+
+    def moved(self, distance, now):
+        if self.pending is None:
+            return
+        if now - self.pending > STALE:
+            self.pending = None  # never moved for it, or play was stopped (question, countdown) meanwhile
+        elif abs(distance) >= MOVE_EPSILON:
+            self.latency.append(now - self.pending)
+            self.pending = None
+
+    def stats(self):
+        if not self.latency:
+            return {'samples': 0}
+        ordered = sorted(self.latency)
+        return {
+            'samples': len(ordered),
+            'mean_ms': round(statistics.fmean(ordered) * 1e3, 3),
+            'p95_ms': round(ordered[int(len(ordered) * 0.95)] * 1e3, 3),
+            'max_ms': round(ordered[-1] * 1e3, 3),
+        }
+
+
+def bench(seconds=4.0, flood=200):
+    """Inputs arrive from another thread at random moments, as from a real device."""
+    from benchmark import bench_games
+    from game import FPS
+
+    post = pygame.event.post
+    Event = pygame.event.Event
+
+    # every event carries the moment it was 'made', so latency includes the wait for the next pump
+    def mouse(rng):
+        post(Event(pygame.MOUSEMOTION, pos=(rng.randrange(100, 800), 600), rel=(0, 0), buttons=(0, 0, 0),
+                   at=time.perf_counter()))
+
+    def keys(rng):
+        key = rng.choice((pygame.K_LEFT, pygame.K_RIGHT))
+        post(Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0, at=time.perf_counter()))
+        time.sleep(rng.uniform(0.03, 0.08))
+        post(Event(pygame.KEYUP, key=key, mod=0, unicode='', scancode=0, at=time.perf_counter()))
+
+    def pad(rng):
+        post(Event(pygame.JOYHATMOTION, joy=0, instance_id=0, hat=0, value=(rng.choice((-1, 1)), 0),
+                   at=time.perf_counter()))
+        time.sleep(rng.uniform(0.03, 0.08))
+        post(Event(pygame.JOYHATMOTION, joy=0, instance_id=0, hat=0, value=(0, 0), at=time.perf_counter()))
+
+    def drive(game, device, done):
+        rng = random.Random(6)
+        while not done.is_set():
+            time.sleep(rng.uniform(0.05, 0.15))
+            if game.show_question:
+                post(Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode='a', scancode=4))
+            device(rng)
+
+    with bench_games('input') as games:
+        game = games.game(log='tel')
+        game.starting_lives = 1000
+        for name, device in (('mouse', mouse), ('keys', keys), ('pad', pad)):
+            random.seed(8)
+            game.start_game_with_difficulty('normal')
+            game.controls = type(game.controls)()
+            game.controls.pad_added(0)  # the pad the hat events below come from
+            done = threading.Event()
+            driver = threading.Thread(target=drive, args=(game, device, done), daemon=True)
+            driver.start()
+            for _ in range(int(seconds * FPS)):
+                dt = game.clock.tick(FPS) / 1000.0
+                game.handle_events()
+                game.update(dt)
+                game.draw()
+            done.set()
+            driver.join()
+            s = game.controls.stats()
+            print(f'{name:>6}: {s["samples"]} movements, input-to-paddle mean {s["mean_ms"]:.1f} ms '
+                  f'(p95 {s["p95_ms"]:.1f}, max {s["max_ms"]:.1f}) at {FPS} ticks/s')
+
+        # a mouse flood plus events nothing handles (blocked ones never enter the queue)
+        for label, filtered in (('unfiltered', False), ('set_allowed', True)):
+            if filtered:
+                allow_events()
+            else:
+                pygame.event.set_allowed(None)
+            game.state = 'menu'
+            spent = 0.0
+            for _ in range(300):
+                for i in range(flood):
+                    post(Event(pygame.MOUSEMOTION, pos=(i, 300), rel=(1, 0), buttons=(0, 0, 0)))
+                    post(Event(pygame.TEXTINPUT, text='x'))
+                t0 = time.perf_counter()
+                game.handle_events()
+                spent += time.perf_counter() - t0
+            print(f'{label:>11}: handle_events() {spent / 300 * 1e6:.0f} us/frame with {flood} motion '
+                  f'and {flood} text events posted per frame')
+        allow_events()
+        game.end_session()
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
@@ -0,0 +1,135 @@
+"""Teacher dashboard: live thumbnails of every game on a classroom server.
+
+    python dashboard.py --host 127.0.0.1 --port 8765
+
+Connects as a watcher, rebuilds each student's game from the binary
+statestream frames and draws them in a grid.
+"""
+import argparse
+import json
+import math
+import socket
+import struct
+import threading
+
+import pygame
+
+from game import (BALL_COLOR, BG_COLOR, BLOCK_COLOR, FONT_NAME, FROZEN_COLOR, PADDLE_COLOR,
+                  PADDLE_HEIGHT, SCREEN_HEIGHT, SCREEN_WIDTH, SPECIAL_COLOR, TEXT_COLOR)
+from statestream import StreamDecoder
+
+_FRAME = struct.Struct('!IH')
+WINDOW = (1280, 800)
+
+
+class StreamClient:
+    """Reads frames on a background thread; the render loop only touches decoded views."""
+    def __init__(self, host, port):
+        self.sock = socket.create_connection((host, port))
+        self.sock.sendall(b'{"op":"watch"}\n')
+        self.decoders = {}
+        self.lock = threading.Lock()
+        self.bytes_received = 0
+        self.connected = True
+        self._thread = threading.Thread(target=self._read_loop, name='dashboard-reader', daemon=True)
+        self._thread.start()
+
+    def _recv_exact(self, n):
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self.sock.recv(n - len(buf))
+            if not chunk:
+                raise ConnectionError('server closed the stream')
+            buf += chunk
+        return bytes(buf)
+
+    def _read_loop(self):
+        try:
+            reply = b''
+            while not reply.endswith(b'\n'):
+                reply += self._recv_exact(1)
+            if json.loads(reply).get('op') != 'watching':
+                raise ConnectionError('unexpected reply')
+            while True:
+                length, sid = _FRAME.unpack(self._recv_exact(_FRAME.size))
+                frame = self._recv_exact(length) if length else b''
+                self.bytes_received += _FRAME.size + length
+                with self.lock:
+                    if not frame:
+                        self.decoders.pop(sid, None)
+                        continue
+                    dec = self.decoders.get(sid)
+                    if dec is None:
+                        dec = self.decoders[sid] = StreamDecoder()
+                    dec.apply(frame)
+        except (ConnectionError, OSError, ValueError):
+            self.connected = False
+
+    def views(self):
+        with self.lock:
+            return [(sid, dec.view) for sid, dec in sorted(self.decoders.items()) if dec.synced]
+
+
+def draw_view(surf, rect, view, font):
+    sx = rect.w / SCREEN_WIDTH
+    sy = rect.h / SCREEN_HEIGHT
+    pygame.draw.rect(surf, (30, 30, 40), rect)
+    for i, (x, y, w, h, special) in enumerate(view.blocks):
+        if not view.block_alive(i):
+            continue
+        color = FROZEN_COLOR if view.block_frozen(i) else SPECIAL_COLOR if special else BLOCK_COLOR
+        surf.fill(color, (rect.x + x * sx, rect.y + y * sy, max(1, w * sx - 1), max(1, h * sy - 1)))
+    pw = view.paddle_w * sx
+    surf.fill(PADDLE_COLOR, (rect.x + view.paddle_x * sx - pw / 2, rect.y + (SCREEN_HEIGHT - 40) * sy,
+                             pw, max(2, PADDLE_HEIGHT * sy)))
+    for x, y in view.balls:
+        pygame.draw.circle(surf, BALL_COLOR, (int(rect.x + x * sx), int(rect.y + y * sy)), 3)
+    label = f'{view.player}  {view.score}  L{view.level}  ♥{view.lives}'
+    if view.question >= 0:
+        label += f'  Q{view.question}'
+    if view.state == 'game_over':
+        label += '  GAME OVER'
+    surf.blit(font.render(label, True, TEXT_COLOR), (rect.x + 4, rect.y + 2))
+    pygame.draw.rect(surf, (90, 90, 100), rect, width=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='PhysiBreak teacher dashboard')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW, pygame.RESIZABLE)
+    pygame.display.set_caption('PhysiBreak - Classroom')
+    font = pygame.font.Font(FONT_NAME, 16)
+    clock = pygame.time.Clock()
+    client = StreamClient(args.host, args.port)
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return 0
+        screen.fill(BG_COLOR)
+        views = client.views()
+        if views:
+            cols = math.ceil(math.sqrt(len(views)))
+            rows = math.ceil(len(views) / cols)
+            w, h = screen.get_size()
+            tw, th = w // cols, (h - 24) // rows
+            # keep the game aspect ratio inside each tile
+            tw, th = min(tw, th * SCREEN_WIDTH // SCREEN_HEIGHT), min(th, tw * SCREEN_HEIGHT // SCREEN_WIDTH)
+            for i, (sid, view) in enumerate(views):
+                r, c = divmod(i, cols)
+                draw_view(screen, pygame.Rect(c * tw, 24 + r * th, tw - 4, th - 4), view, font)
+        status = f'{len(views)} students   {client.bytes_received / 1024:.0f} KiB received'
+        if not client.connected:
+            status += '   (disconnected)'
+        screen.blit(font.render(status, True, TEXT_COLOR), (6, 4))
+        pygame.display.flip()
+        clock.tick(30)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,351 @@
+"""Resolution-independent presentation and the two render backends.
+
+The game lays everything out in logical pixels and always draws one
+SCREEN_WIDTH x SCREEN_HEIGHT frame; Display gets that frame into a window of
+whatever size the projector or netbook has:
+
+    'scaled'    pygame.SCALED: SDL's renderer stretches the logical surface
+                (on the GPU where there is one) and maps mouse positions back
+                to logical coordinates by itself.
+    'blit'      software: the logical frame is scaled straight into the
+                letterboxed part of a resizable window. The target rectangle
+                and the window subsurface are worked out once per window size;
+                smooth=True uses smoothscale instead of nearest-neighbour.
+                handle_events() maps mouse positions back via to_logical().
+    'renderer'  pygame._sdl2.video Renderer/Texture: the play field is drawn
+                as copies of cached textures (one per block size and colour,
+                paddle width, ball radius, text line) instead of being
+                rasterized every frame. Runs on SDL's software renderer too
+                (software=True forces it), so no GPU is needed.
+
+The game draws through Display.canvas, a SurfaceCanvas or a TextureCanvas
+with the same methods: clear, rect, fill, ellipse, circle, blit (a surface,
+typically rendered text), blits (many of them), begin_field/end_field around the play field, and
+layer() for what is still drawn in software on Display.surface (menus,
+lessons, the question modal).
+
+render_scale < 1 (surface backends) draws the play field into a smaller
+surface that is scaled up into the logical frame, while text and menus stay
+at full resolution: for machines where filling pixels is the bottleneck. 0.5
+is the cheap one; the upscale is then an exact doubling.
+
+    python display.py --bench     # present cost per classroom resolution; both backends on the same recorded scenes
+"""
+import sys
+import time
+
+import pygame
+
+MODES = ('scaled', 'blit', 'renderer')
+CLASSROOM_SIZES = [(1024, 768), (1280, 800), (1366, 768), (1920, 1080)]
+TEXTURE_CACHE = 512  # textures kept before the cache starts over
+
+
+class SurfaceCanvas:
+    """Draws straight onto the logical surface with pygame.draw and blit."""
+    def __init__(self, surface, render_scale=1.0):
+        self.surface = surface
+        self.target = surface  # what the primitives draw on: the frame, or the low-resolution field
+        self.k = 1  # scale from logical pixels to `target` pixels
+        self.field = None
+        self.set_render_scale(render_scale)
+
+    def set_render_scale(self, scale):
+        self.render_scale = scale
+        if scale < 1:
+            w, h = self.surface.get_size()
+            self.field = pygame.Surface((max(1, int(w * scale)), max(1, int(h * scale)))).convert()
+        else:
+            self.field = None
+
+    def clear(self, color):
+        if self.field is None:
+            self.surface.fill(color)  # a low-resolution field is scaled over the whole frame anyway
+        self._bg = color
+
+    def begin_field(self):
+        if self.field is not None:
+            self.target = self.field
+            self.k = self.render_scale
+            self.field.fill(self._bg)
+
+    def end_field(self):
+        if self.field is not None:
+            pygame.transform.scale(self.field, self.surface.get_size(), self.surface)
+            self.target = self.surface
+            self.k = 1
+
+    def rect(self, color, rect, radius=0):
+        k = self.k
+        x, y, w, h = rect
+        pygame.draw.rect(self.target, color, (x * k, y * k, w * k, h * k), border_radius=max(1, round(radius * k)))
+
+    def fill(self, color, rect):
+        k = self.k
+        x, y, w, h = rect
+        self.target.fill(color, (x * k, y * k, max(1, w * k), max(1, h * k)))
+
+    def ellipse(self, color, rect):
+        k = self.k
+        x, y, w, h = rect
+        pygame.draw.ellipse(self.target, color, (x * k, y * k, w * k, h * k))
+
+    def circle(self, color, center, radius):
+        k = self.k
+        pygame.draw.circle(self.target, color, (center[0] * k, center[1] * k), max(1, radius * k))
+
+    def blit(self, surface, pos):
+        self.surface.blit(surface, pos)
+
+    def blits(self, batch):
+        self.surface.blits(batch, doreturn=False)
+
+    def layer(self, key, draw):
+        draw()  # software screens draw on this canvas's own surface
+
+
+class TextureCanvas:
+    """Draws with an SDL Renderer: shapes and text become cached textures that are only copied per frame."""
+    def __init__(self, renderer, surface):
+        from pygame._sdl2.video import Texture
+
+        self.Texture = Texture
+        self.renderer = renderer
+        self.surface = surface  # software layer for menus, lessons and the question modal
+        self.shapes = {}  # (kind, w, h, color, radius) -> texture
+        self.texts = {}  # rendered surface -> texture
+        self._frame = Texture(renderer, surface.get_size(), streaming=True)
+        self._frame.blend_mode = 1  # SDL_BLENDMODE_BLEND: the modal's overlay stays translucent
+        self._frame_key = None
+
+    def _shape(self, kind, w, h, color, radius=0):
+        key = (kind, w, h, color, radius)
+        tex = self.shapes.get(key)
+        if tex is None:
+            if len(self.shapes) > TEXTURE_CACHE:
+                self.shapes.clear()
+            surf = pygame.Surface((w, h), pygame.SRCALPHA)
+            if kind == 'rect':
+                pygame.draw.rect(surf, color, (0, 0, w, h), border_radius=radius)
+            elif kind == 'ellipse':
+                pygame.draw.ellipse(surf, color, (0, 0, w, h))
+            else:
+                pygame.draw.circle(surf, color, (w // 2, h // 2), radius)
+            tex = self.shapes[key] = self.Texture.from_surface(self.renderer, surf)
+        return tex
+
+    def clear(self, color):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def begin_field(self):
+        pass
+
+    def end_field(self):
+        pass
+
+    def rect(self, color, rect, radius=0):
+        x, y, w, h = rect
+        self._shape('rect', w, h, color, radius).draw(dstrect=(x, y, w, h))
+
+    def fill(self, color, rect):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect(rect)
+
+    def ellipse(self, color, rect):
+        x, y, w, h = rect
+        self._shape('ellipse', w, h, color).draw(dstrect=(x, y, w, h))
+
+    def circle(self, color, center, radius):
+        size = 2 * radius + 1
+        self._shape('circle', size, size, color, radius).draw(dstrect=(center[0] - radius, center[1] - radius,
+                                                                       size, size))
+
+    def blit(self, surface, pos):
+        # text surfaces come from the game's render_text cache, so the same object means the same text
+        tex = self.texts.get(surface)
+        if tex is None:
+            if len(self.texts) > TEXTURE_CACHE:
+                self.texts.clear()
+            tex = self.texts[surface] = self.Texture.from_surface(self.renderer, surface)
+        tex.draw(dstrect=(pos[0], pos[1], tex.width, tex.height))
+
+    def blits(self, batch):
+        blit = self.blit
+        for surface, pos in batch:
+            blit(surface, pos)
+
+    def layer(self, key, draw):
+        """draw() paints on the software surface, which is then uploaded and copied over the frame.
+
+        While `key` stays the same (and is not None) the previous upload is reused without drawing again.
+        """
+        if key is None or key != self._frame_key:
+            self.surface.fill((0, 0, 0, 0))
+            draw()
+            self._frame.update(self.surface)
+            self._frame_key = key
+        self._frame.draw()
+
+
+class Display:
+    def __init__(self, logical_size, mode='scaled', window_size=None, smooth=False, render_scale=1.0,
+                 software=False, title='PhysiBreak'):
+        if mode not in MODES:
+            raise ValueError(f'unknown display mode {mode!r}')
+        self.logical_size = logical_size
+        self.mode = mode
+        self.smooth = smooth
+        self.renderer = None
+        if mode == 'renderer':
+            from pygame._sdl2.video import Renderer, Window
+
+            self.window = Window(title, size=window_size or logical_size, resizable=True)
+            self.renderer = Renderer(self.window, accelerated=0 if software else -1)
+            self.renderer.logical_size = logical_size  # SDL scales the output and the mouse coordinates
+            self.surface = pygame.Surface(logical_size, pygame.SRCALPHA)
+            self.canvas = TextureCanvas(self.renderer, self.surface)
+            return
+        if mode == 'scaled':
+            self.window = pygame.display.set_mode(logical_size, pygame.SCALED | pygame.RESIZABLE)
+            self.surface = self.window
+        else:
+            self.window = pygame.display.set_mode(window_size or logical_size, pygame.RESIZABLE)
+            self.surface = pygame.Surface(logical_size).convert()
+        self._target = None  # (window size, rect in the window, window subsurface) the frame is scaled into
+        self.canvas = SurfaceCanvas(self.surface, render_scale)
+
+    def resized(self):
+        if self.mode == 'blit':
+            self.window = pygame.display.get_surface()
+            self._target = None
+
+    def target(self):
+        size = self.window.get_size()
+        if self._target is None or self._target[0] != size:
+            lw, lh = self.logical_size
+            scale = min(size[0] / lw, size[1] / lh)
+            w, h = max(1, int(lw * scale)), max(1, int(lh * scale))
+            rect = pygame.Rect((size[0] - w) // 2, (size[1] - h) // 2, w, h)
+            self.window.fill((0, 0, 0))  # letterbox bars, drawn once per size
+            self._target = (size, rect, self.window.subsurface(rect))
+        return self._target
+
+    def present(self):
+        if self.renderer is not None:
+            self.renderer.present()
+            return
+        if self.mode == 'blit':
+            _, rect, dest = self.target()
+            if rect.size == self.logical_size:
+                dest.blit(self.surface, (0, 0))
+            elif self.smooth:
+                pygame.transform.smoothscale(self.surface, rect.size, dest)
+            else:
+                pygame.transform.scale(self.surface, rect.size, dest)
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        if self.mode != 'blit':
+            return pos  # SDL already did it
+        _, rect, _ = self.target()
+        lw, lh = self.logical_size
+        return ((pos[0] - rect.x) * lw // rect.w, (pos[1] - rect.y) * lh // rect.h)
+
+
+def record_scenes(game, frames=60):
+    """Recorded RenderStates: {scene: [view per frame]} for a few kinds of screen the game shows."""
+    import random
+    from game import BonusCapsulesPowerUp, LaserPowerUp, MultiBallPowerUp
+
+    def play(setup=None):
+        random.seed(12)
+        game.start_game_with_difficulty('normal')
+        if setup:
+            setup()
+        views = []
+        while len(views) < frames:
+            game.show_question = False  # stay in plain play
+            game.paddle_target = game.balls[0].pos.x if game.balls else 450
+            game.update(1 / 60)
+            views.append(game.render_state())
+        return views
+
+    def busy():
+        for powerup in (LaserPowerUp(interval=0.05), BonusCapsulesPowerUp(), MultiBallPowerUp()):
+            game.spawn_powerup(powerup)
+
+    scenes = {'play': play(), 'lasers+capsules': play(busy)}
+    game.show_question = True
+    game.current_question = game.qman.get_question(0)
+    scenes['question'] = [game.render_state()] * frames
+    game.show_question = False
+    game.state = 'menu'
+    scenes['menu'] = [game.render_state()] * frames
+    return scenes
+
+
+def bench(frames=120):
+    import random
+    from benchmark import bench_game
+    from game import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    random.seed(12)
+    with bench_game('display') as game:
+        scenes = record_scenes(game)
+        view = scenes['play'][-1]
+        logical = (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        def timed(fn):
+            t0 = time.perf_counter()
+            for _ in range(frames):
+                fn()
+            return (time.perf_counter() - t0) / frames * 1e3
+
+        def use(mode, **kw):
+            pygame.display.quit()  # SDL will not put a second SCALED renderer on a window
+            pygame.display.init()
+            game.display = Display(logical, mode, **kw)
+            game.screen = game.display.surface
+
+        def replay(views):
+            frame = iter(views * (frames // len(views) + 1))
+
+            def draw():
+                game.draw(next(frame))
+                game.display.present()
+            game.draw(views[0])  # fill the caches first: the bench is about steady-state frames
+            return timed(draw)
+
+        print(f'present() of a {SCREEN_WIDTH}x{SCREEN_HEIGHT} frame, ms/frame (SDL video driver: '
+              f'{pygame.display.get_driver()})')
+        print(f'{"window":>11} {"scaled":>8} {"blit":>8} {"smooth":>8}')
+        for size in CLASSROOM_SIZES:
+            row = []
+            for mode, smooth in (('scaled', False), ('blit', False), ('blit', True)):
+                use(mode, window_size=size, smooth=smooth)
+                if mode == 'scaled':
+                    from pygame._sdl2.video import Window
+                    Window.from_display_module().size = size  # what a resize to `size` would do
+                    pygame.event.pump()
+                game.draw(view)
+                row.append(timed(game.display.present))
+            print(f'{size[0]:>5}x{size[1]:<5} ' + ' '.join(f'{ms:8.3f}' for ms in row))
+
+        print('draw() + present() of the recorded scenes, ms/frame')
+        backends = [('surface', 'scaled', {}), ('surface x0.5', 'scaled', {'render_scale': 0.5}),
+                    ('renderer (sw)', 'renderer', {'software': True})]
+        print(f'{"scene":>16} ' + ' '.join(f'{label:>14}' for label, _, _ in backends))
+        for name, views in scenes.items():
+            row = []
+            for _, mode, kw in backends:
+                use(mode, **kw)
+                row.append(replay(views))
+            print(f'{name:>16} ' + ' '.join(f'{ms:14.3f}' for ms in row))
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
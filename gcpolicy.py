@@ -0,0 +1,168 @@
+"""Garbage-collector policy for stutter-free play.
+
+In 'managed' mode everything alive after startup (question bank, lessons,
+fonts, sounds) is moved out of the collector's reach with gc.freeze(), the
+automatic collector is switched off while a level is being played, and the
+collections it would have run happen at natural pauses instead: the
+question modal, countdowns and level transitions. A safety valve still
+collects if a very long stretch of play piles up garbage.
+
+Every collection is timed through gc.callbacks and charged to the frame it
+happened in, so stats() reports per-frame GC pauses in play and at pauses.
+'measure' leaves the collector alone and only times it; 'off' does nothing
+(headless server games, where many games share one process).
+
+    python gcpolicy.py --bench     # per-frame GC pauses, measure vs managed, over simulated play
+"""
+import gc
+import random
+import sys
+import time
+
+PAUSE_MIN = 200  # young objects worth a collection at a natural pause
+SAFETY_LIMIT = 50000  # young objects that force a collection even mid-play
+FULL_EVERY = 4  # every Nth pause collection includes the oldest generation
+
+
+class GCPolicy:
+    def __init__(self, mode='managed'):
+        if mode not in ('off', 'measure', 'managed'):
+            raise ValueError(f'unknown gc policy {mode!r}')
+        self.mode = mode
+        self.holding = False  # automatic collection switched off for play
+        self._started = 0.0
+        self._frame = 0.0  # GC time charged to the current frame
+        self._pauses = 0
+        self._in_play = False
+        self.reset_stats()
+        if mode != 'off':
+            gc.callbacks.append(self._on_gc)
+
+    def reset_stats(self):
+        self.frames = 0
+        self.play_frames = 0
+        self.collections = 0
+        self.play_collections = 0  # collections that landed in a frame of active play
+        self.play_max = 0.0
+        self.play_total = 0.0
+        self.pause_max = 0.0
+        self.pause_total = 0.0
+        self.worst = []  # longest in-play frame pauses, for the p99 estimate
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._started = time.perf_counter()
+        else:
+            self._frame += time.perf_counter() - self._started
+            self.collections += 1
+            if self._in_play:
+                self.play_collections += 1
+
+    def after_startup(self):
+        # long-lived content never changes during play; keep it out of every future collection
+        if self.mode == 'managed':
+            gc.collect()
+            gc.freeze()
+
+    def pause(self, full=False):
+        """A natural break in play: run the collections play has been holding back."""
+        if self.mode != 'managed':
+            return
+        if full:
+            gc.collect()
+        elif gc.get_count()[0] >= PAUSE_MIN:
+            self._pauses += 1
+            gc.collect(2 if self._pauses % FULL_EVERY == 0 else 1)
+
+    def end_frame(self, playing):
+        if self.mode == 'off':
+            return
+        if self.mode == 'managed':
+            if playing != self.holding:
+                if playing:
+                    gc.disable()
+                else:
+                    gc.enable()
+                self.holding = playing
+            if playing and gc.get_count()[0] > SAFETY_LIMIT:
+                gc.collect(0)
+        spent = self._frame
+        self._frame = 0.0
+        self.frames += 1
+        if self._in_play:
+            self.play_frames += 1
+            if spent:
+                self.play_total += spent
+                if spent > self.play_max:
+                    self.play_max = spent
+                self.worst.append(spent)
+                if len(self.worst) > 64:
+                    self.worst.sort(reverse=True)
+                    del self.worst[32:]
+        elif spent:
+            self.pause_total += spent
+            if spent > self.pause_max:
+                self.pause_max = spent
+        self._in_play = playing  # the next frame's collections belong to this state
+
+    def stats(self):
+        worst = sorted(self.worst, reverse=True)
+        rank = self.play_frames // 100  # frames above the 99th percentile
+        p99 = worst[rank] if rank < len(worst) else 0.0
+        return {
+            'mode': self.mode,
+            'frames': self.frames,
+            'play_frames': self.play_frames,
+            'collections': self.collections,
+            'play_collections': self.play_collections,
+            'play_max_ms': round(self.play_max * 1e3, 3),
+            'play_p99_ms': round(p99 * 1e3, 3),
+            'play_total_ms': round(self.play_total * 1e3, 3),
+            'pause_max_ms': round(self.pause_max * 1e3, 3),
+            'pause_total_ms': round(self.pause_total * 1e3, 3),
+        }
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.holding:
+            gc.enable()
+            self.holding = False
+
+
+def bench(frames=7200):
+    from benchmark import bench_games
+    from game import FPS
+
+    with bench_games('gc') as games:
+        for mode in ('measure', 'managed'):
+            random.seed(9)
+            game = games.game(log=mode, gc_mode=mode)
+            policy = game.gc_policy
+            policy.after_startup()
+            game.starting_lives = 1000  # one session, so end_session() never resets the stats mid-run
+            game.start_game_with_difficulty('normal')
+            policy.reset_stats()
+            for i in range(frames):
+                if game.show_question and i % 30 == 0:
+                    game.answer_question(i % 3)
+                if game.state != 'playing':
+                    game.start_game_with_difficulty('normal')
+                game.paddle_target = game.balls[0].pos.x if game.balls else 450
+                game.update(1 / FPS)
+                game.draw()
+                policy.end_frame(game.in_play())
+            s = policy.stats()
+            policy.close()
+            game.telemetry.close()
+            gc.unfreeze()
+            print(f'{mode:>8}: {s["play_frames"]} play frames, {s["play_collections"]} collections during play '
+                  f'(max {s["play_max_ms"]:.3f} ms, p99 {s["play_p99_ms"]:.3f} ms), '
+                  f'{s["collections"] - s["play_collections"]} at pauses (max {s["pause_max_ms"]:.3f} ms)')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
@@ -0,0 +1,329 @@
+"""Level layouts for PhysiBreak.
+
+generate_layout() builds a level as plain data - (x, y, kind, hp, qtag)
+cells - that always fits the screen and never exceeds MAX_BLOCKS. Difficulty
+rises through block HP, tough-block density and question density rather than
+grid size. LevelPipeline computes the next layout on a worker thread while
+the current level is played, so a level transition only has to instantiate
+blocks.
+
+Authored levels live in .pblv files: a small header followed by a row-major
+tile map, one 4-byte tile per cell (little-endian):
+    b'PBLV'  u16 version  u16 cols  u32 rows
+    tile:    u8 kind  u8 hp  i16 qtag    (qtag -1: question picked by the scheduler)
+LevelMap reads them through mmap, and LevelStream turns only the rows near
+the viewport into blocks, scrolling the level down as the lowest rows are
+cleared, so a level thousands of rows tall plays like a single screen.
+
+    python levels.py --demo tall.pblv [rows]   # write a tall procedural level
+    python levels.py --bench                   # per-frame cost, streamed map vs one screen
+"""
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+KIND_EMPTY = 0
+KIND_NORMAL = 1
+KIND_TOUGH = 2
+KIND_QUESTION = 3
+
+MAX_ROWS = 9
+MAX_BLOCKS = 96
+MAX_HP = 4
+SIDE_MARGIN = 10
+
+MAP_MAGIC = b'PBLV'
+MAP_VERSION = 1
+_MAP_HEADER = struct.Struct('<4sHHI')
+_TILE = struct.Struct('<BBh')
+
+STREAM_MARGIN = 2  # rows above the screen that already exist as blocks
+SCROLL_SPEED = 90.0  # px/s the level slides down once its lowest rows are cleared
+
+PATTERNS = ['full', 'checker', 'pyramid', 'diamond', 'stripes', 'columns', 'frame']
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _worker():
+    # one background thread shared by every game in the process (the classroom server runs hundreds)
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-gen')
+        return _executor
+
+
+def grid_size(level, screen_width, block_w, pad, base_rows=6, base_cols=10):
+    max_cols = (screen_width - 2 * SIDE_MARGIN + pad) // (block_w + pad)
+    cols = min(max_cols, base_cols + (level - 1) // 3)
+    rows = min(MAX_ROWS, base_rows + (level - 1) // 2)
+    while rows * cols > MAX_BLOCKS:
+        rows -= 1
+    return rows, cols
+
+
+def _keep(pattern, r, c, rows, cols):
+    if pattern == 'checker':
+        return (r + c) % 2 == 0
+    if pattern == 'pyramid':
+        inset = r * cols // (2 * rows)
+        return inset <= c < cols - inset
+    if pattern == 'diamond':
+        mid_r, mid_c = (rows - 1) / 2, (cols - 1) / 2
+        return abs(r - mid_r) / (mid_r + 1) + abs(c - mid_c) / (mid_c + 1) <= 1.0
+    if pattern == 'stripes':
+        return r % 3 != 2
+    if pattern == 'columns':
+        return c % 3 != 1
+    if pattern == 'frame':
+        return r in (0, rows - 1) or c in (0, cols - 1) or (r % 2 == 0 and c % 2 == 0)
+    return True
+
+
+def generate_layout(level, seed, screen_width, block_w, block_h, pad, top_offset,
+                    base_rows=6, base_cols=10):
+    """Return [(x, y, kind, hp, qtag)] for `level`; deterministic for a given (seed, level)."""
+    rng = random.Random((seed << 16) | level)
+    rows, cols = grid_size(level, screen_width, block_w, pad, base_rows, base_cols)
+    pattern = PATTERNS[0] if level == 1 else rng.choice(PATTERNS)
+    grid_width = cols * (block_w + pad) - pad
+    start_x = (screen_width - grid_width) // 2
+
+    question_chance = min(0.2 + 0.05 * (level - 1), 0.5)
+    tough_chance = min(0.1 * (level - 1), 0.6)
+    max_hp = min(MAX_HP, 2 + (level - 1) // 3)
+
+    cells = []
+    for r in range(rows):
+        for c in range(cols):
+            if not _keep(pattern, r, c, rows, cols):
+                continue
+            x = start_x + c * (block_w + pad)
+            y = top_offset + r * (block_h + pad)
+            roll = rng.random()
+            if roll < question_chance:
+                cells.append((x, y, KIND_QUESTION, 1, -1))
+            elif roll < question_chance + tough_chance:
+                cells.append((x, y, KIND_TOUGH, rng.randint(2, max_hp), -1))
+            else:
+                cells.append((x, y, KIND_NORMAL, 1, -1))
+    return cells
+
+
+class LevelPipeline:
+    """Generates the upcoming level in the background; falls back to building it inline."""
+    def __init__(self, **geometry):
+        self.geometry = geometry
+        self._pending = None  # (level, seed, future)
+
+    def prefetch(self, level, seed):
+        pending = self._pending
+        if pending is not None and pending[0] == level and pending[1] == seed:
+            return
+        self._pending = (level, seed, _worker().submit(generate_layout, level, seed, **self.geometry))
+
+    def take(self, level, seed):
+        pending = self._pending
+        self._pending = None
+        if pending is not None and pending[0] == level and pending[1] == seed:
+            return pending[2].result()
+        return generate_layout(level, seed, **self.geometry)
+
+
+# ------------------------
+# Level files
+# ------------------------
+def write_level(path, cols, rows):
+    """Write a tile map; `rows` is an iterable of rows, each `cols` (kind, hp, qtag) tuples."""
+    body = bytearray()
+    nrows = 0
+    for row in rows:
+        if len(row) != cols:
+            raise ValueError(f'row {nrows} has {len(row)} tiles, expected {cols}')
+        for kind, hp, qtag in row:
+            body += _TILE.pack(kind, hp, qtag)
+        nrows += 1
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, cols, nrows))
+        f.write(body)
+    os.replace(tmp, path)
+
+
+class LevelMap:
+    """Read-only, memory-mapped view of a .pblv file; rows are decoded on demand."""
+    def __init__(self, path):
+        self.path = os.path.abspath(path)  # snapshots refer back to the map by this path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.cols, self.rows = _MAP_HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f'{path}: not a PhysiBreak level')
+        if magic != MAP_MAGIC:
+            self._mm.close()
+            raise ValueError(f'{path}: not a PhysiBreak level')
+        if version != MAP_VERSION:
+            self._mm.close()
+            raise ValueError(f'{path}: unsupported level version {version} (expected {MAP_VERSION})')
+        self._row_bytes = self.cols * _TILE.size
+        if len(self._mm) < _MAP_HEADER.size + self.rows * self._row_bytes:
+            self._mm.close()
+            raise ValueError(f'{path}: truncated tile map')
+
+    def row(self, r):
+        """[(col, kind, hp, qtag)] for the non-empty tiles of row `r`."""
+        off = _MAP_HEADER.size + r * self._row_bytes
+        return [(c, kind, hp, qtag)
+                for c, (kind, hp, qtag) in enumerate(_TILE.iter_unpack(self._mm[off:off + self._row_bytes]))
+                if kind != KIND_EMPTY]
+
+    def close(self):
+        self._mm.close()
+
+
+class LevelStream:
+    """Scrolls a LevelMap past the screen, keeping only rows near the viewport as blocks.
+
+    Map row rows-1 starts at the bottom of the normal block field; each row
+    is handed out as cells once it scrolls to within STREAM_MARGIN rows of
+    the top of the screen. Cleared blocks are dropped when rows stream in.
+    """
+    def __init__(self, level_map, screen_width, block_w, block_h, pad, top_offset,
+                 base_rows=6, base_cols=10, next_row=None, scroll=0.0, shifted=0):
+        max_cols = (screen_width - 2 * SIDE_MARGIN + pad) // (block_w + pad)
+        if level_map.cols > max_cols:
+            raise ValueError(f'{level_map.path}: {level_map.cols} columns, the screen fits {max_cols}')
+        self.map = level_map
+        self.block_w = block_w
+        self.block_h = block_h
+        self.step = block_h + pad
+        self.view_rows = min(level_map.rows, base_rows)
+        self.field_bottom = top_offset + self.view_rows * self.step
+        self.start_x = (screen_width - (level_map.cols * (block_w + pad) - pad)) // 2
+        self.base_y = top_offset - (level_map.rows - self.view_rows) * self.step  # screen y of row 0, unscrolled
+        self.pad = pad
+        self.next_row = level_map.rows - 1 if next_row is None else next_row  # next row to materialize
+        self.scroll = scroll      # how far the level has slid down, px
+        self.shifted = shifted    # whole pixels of that already applied to live blocks
+
+    def done(self):
+        return self.next_row < 0
+
+    def row_y(self, r):
+        return self.base_y + r * self.step + self.shifted
+
+    def take_rows(self):
+        """Cells of every row that has scrolled into range since the last call (None if none has)."""
+        limit = -STREAM_MARGIN * self.step
+        if self.next_row < 0 or self.row_y(self.next_row) < limit:
+            return None
+        cells = []
+        while self.next_row >= 0 and self.row_y(self.next_row) >= limit:
+            y = self.row_y(self.next_row)
+            for c, kind, hp, qtag in self.map.row(self.next_row):
+                cells.append((self.start_x + c * (self.block_w + self.pad), y, kind, hp, qtag))
+            self.next_row -= 1
+        return cells
+
+    def update(self, blocks, dt):
+        """Slide the level down toward the field bottom; returns new cells to materialize."""
+        lowest = -1
+        for b in blocks:
+            if b.alive and b.rect.bottom > lowest:
+                lowest = b.rect.bottom
+        if lowest < 0:
+            # nothing alive on screen: bring the next row in quickly
+            gap = self.field_bottom - (self.row_y(self.next_row) + self.block_h) if self.next_row >= 0 else 0
+        else:
+            gap = self.field_bottom - lowest
+        if gap <= 0:
+            return None
+        self.scroll += min(gap, SCROLL_SPEED * dt * (4 if lowest < 0 else 1))
+        move = int(self.scroll) - self.shifted
+        if move:
+            self.shifted += move
+            for b in blocks:
+                b.rect.y += move
+        return self.take_rows()
+
+
+def demo_rows(rows, cols, seed=1):
+    rng = random.Random(seed)
+    for r in range(rows):
+        tiles = []
+        for c in range(cols):
+            roll = rng.random()
+            if (r // 6) % 4 == 3 and c % 3 == 1:
+                tiles.append((KIND_EMPTY, 0, -1))
+            elif roll < 0.2:
+                tiles.append((KIND_QUESTION, 1, -1))
+            elif roll < 0.4:
+                tiles.append((KIND_TOUGH, rng.randint(2, MAX_HP), -1))
+            else:
+                tiles.append((KIND_NORMAL, 1, -1))
+        yield tiles
+
+
+def bench(rows=3000, frames=1200):
+    from benchmark import bench_games
+    from game import FPS
+
+    with bench_games('levels') as scratch:
+        short = os.path.join(scratch.dir, 'short.pblv')
+        write_level(short, 10, demo_rows(12, 10))
+        path = os.path.join(scratch.dir, 'tall.pblv')
+        write_level(path, 10, demo_rows(rows, 10))
+
+        def run(level_path):
+            random.seed(5)
+            t0 = time.perf_counter()
+            game = scratch.game(headless=True, level_path=level_path)
+            game.start_game_with_difficulty('easy')
+            load = time.perf_counter() - t0
+            total = 0.0
+            peak = 0
+            for i in range(frames):
+                if game.show_question:
+                    game.answer_question(0)
+                if game.state != 'playing':
+                    game.start_game_with_difficulty('easy')
+                if i % 4 == 0:
+                    # chew through the lowest row so the stream keeps scrolling
+                    for b in game.blocks:
+                        if b.alive and not hasattr(b, 'question_id'):
+                            b.alive = False
+                            break
+                game.paddle_target = game.balls[0].pos.x if game.balls else 450
+                t0 = time.perf_counter()
+                game.update(1 / FPS)
+                total += time.perf_counter() - t0
+                peak = max(peak, len(game.blocks))
+            return load, total / frames, peak, game
+
+        for label, level_path in (('procedural', None), ('12-row map', short), (f'{rows}-row map', path)):
+            load, per_frame, peak, _ = run(level_path)
+            print(f'{label:>14}: start {load * 1e3:6.2f} ms  update {per_frame * 1e6:6.1f} us/frame  '
+                  f'<= {peak} blocks')
+        print(f'({rows * 10} tiles, {os.path.getsize(path) / 1024:.0f} KiB on disk)')
+
+
+if __name__ == '__main__':
+    if '--demo' in sys.argv:
+        args = sys.argv[sys.argv.index('--demo') + 1:]
+        out = args[0] if args else 'tall.pblv'
+        count = int(args[1]) if len(args) > 1 else 500
+        write_level(out, 10, demo_rows(count, 10))
+        print(f'wrote {out}: {count} rows')
+    elif '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
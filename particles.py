@@ -0,0 +1,223 @@
+"""Particle effects for block breaks, power-ups, lost lives and answers.
+
+All particles live in one fixed-capacity pool of NumPy arrays (position,
+velocity, remaining and total life, style) with the live ones packed at the
+front, so a frame is a handful of vectorized steps: integrate, age, compact
+out the dead. Drawing is one batch of (sprite, position) pairs handed to the
+canvas, which blits them in a single Surface.blits() call; sprites are small
+squares made once per style and fade step.
+
+NumPy is only imported by load(), which the game calls when a session
+starts; without NumPy (or headless) every call is a no-op and the game
+simply shows no particles.
+
+Particles.cost is the time spent on them per frame, smoothed. While it is
+over the budget, the live limit shrinks and the oldest particles are culled;
+bursts shrink in proportion. With time to spare again the limit grows back.
+
+    python particles.py --bench     # cost per frame by live count, and the limit under a tight budget
+"""
+import sys
+import time
+
+import pygame
+
+CAPACITY = 4096
+BUDGET_MS = 1.5  # particle update, batching and drawing per frame
+MIN_LIMIT = 64
+FADES = 4  # alpha steps a particle fades through
+GRAVITY = 520.0  # px/s^2
+SMOOTHING = 0.1  # weight of the newest frame in the cost average
+
+# name -> (count, (min, max) speed in px/s, (min, max) life in s, size in px)
+EFFECTS = {
+    'break': (14, (60.0, 240.0), (0.3, 0.6), 3),
+    'powerup': (32, (100.0, 320.0), (0.4, 0.9), 4),
+    'life_lost': (48, (80.0, 360.0), (0.5, 1.1), 4),
+    'answer': (40, (80.0, 300.0), (0.4, 0.8), 4),
+}
+
+
+class Particles:
+    def __init__(self, capacity=CAPACITY, budget_ms=BUDGET_MS, enabled=True):
+        self.capacity = capacity
+        self.budget = budget_ms / 1e3
+        self.enabled = enabled
+        self.np = None  # numpy, once load() found it
+        self.count = 0  # live particles, packed at [0:count]
+        self.limit = capacity  # live particles allowed; lowered while over budget
+        self.cost = 0.0  # seconds per frame, smoothed
+        self._spent = 0.0  # seconds spent since the last update()
+        self.styles = {}  # (color, size) -> style index
+        self.sprites = []  # style * FADES + fade step -> surface
+        self.emitted = 0
+        self.culled = 0
+
+    def load(self):
+        if not self.enabled or self.np is not None:
+            return
+        try:
+            import numpy as np
+        except ImportError:
+            self.enabled = False
+            return
+        self.np = np
+        self.rng = np.random.default_rng()  # its own generator: effects never disturb the game's `random`
+        n = self.capacity
+        self.pos = np.zeros((n, 2), np.float32)
+        self.vel = np.zeros((n, 2), np.float32)
+        self.life = np.zeros(n, np.float32)
+        self.ttl = np.ones(n, np.float32)
+        self.style = np.zeros(n, np.int32)
+
+    def _style(self, color, size):
+        key = (tuple(color), size)
+        style = self.styles.get(key)
+        if style is None:
+            style = self.styles[key] = len(self.styles)
+            for fade in range(FADES):
+                sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+                sprite.fill((*key[0][:3], 255 * (fade + 1) // FADES))
+                self.sprites.append(sprite)
+        return style
+
+    def burst(self, effect, x, y, color):
+        if self.np is None:
+            return
+        t0 = time.perf_counter()
+        count, (slow, fast), (short, long), size = EFFECTS[effect]
+        count = min(max(1, count * self.limit // self.capacity), self.limit - self.count)
+        if count <= 0:
+            return
+        np, rng = self.np, self.rng
+        s = slice(self.count, self.count + count)
+        angle = rng.uniform(0.0, 2 * np.pi, count)
+        speed = rng.uniform(slow, fast, count)
+        self.pos[s] = (x, y)
+        self.vel[s, 0] = np.cos(angle) * speed
+        self.vel[s, 1] = np.sin(angle) * speed
+        self.ttl[s] = self.life[s] = rng.uniform(short, long, count)
+        self.style[s] = self._style(color, size)
+        self.count += count
+        self.emitted += count
+        self._spent += time.perf_counter() - t0
+
+    def update(self, dt):
+        if self.np is None:
+            return
+        t0 = time.perf_counter()
+        self._account()
+        n = self.count
+        if n:
+            vel = self.vel[:n]
+            vel[:, 1] += GRAVITY * dt
+            self.pos[:n] += vel * dt
+            life = self.life[:n]
+            life -= dt
+            alive = life > 0
+            if not alive.all():
+                k = int(alive.sum())
+                for a in (self.pos, self.vel, self.life, self.ttl, self.style):
+                    a[:k] = a[:n][alive]
+                self.count = k
+        self._spent += time.perf_counter() - t0
+
+    def _account(self):
+        # fold the last frame into the average, then move the limit toward the budget
+        self.cost += (self._spent - self.cost) * SMOOTHING
+        self._spent = 0.0
+        if self.cost > self.budget and self.limit > MIN_LIMIT:
+            self.limit = max(MIN_LIMIT, self.limit * 3 // 4)
+            self.cost = self.budget  # give the smaller limit a few frames to show its effect
+            self.cull()
+        elif self.cost < self.budget / 2 and self.limit < self.capacity:
+            self.limit = min(self.capacity, self.limit + self.capacity // 16)
+
+    def cull(self):
+        extra = self.count - self.limit
+        if extra > 0:  # keep the youngest
+            for a in (self.pos, self.vel, self.life, self.ttl, self.style):
+                a[:self.limit] = a[extra:self.count]
+            self.count = self.limit
+            self.culled += extra
+
+    def batch(self):
+        """(sprite, (x, y)) pairs for the live particles; shares nothing with the pool."""
+        n = self.count
+        if not n:
+            return ()
+        t0 = time.perf_counter()
+        np = self.np
+        fade = np.minimum((self.life[:n] / self.ttl[:n] * FADES).astype(np.int32), FADES - 1)
+        index = (self.style[:n] * FADES + fade).tolist()
+        xy = self.pos[:n].astype(np.int32).tolist()
+        sprites = self.sprites
+        out = [(sprites[i], p) for i, p in zip(index, xy)]
+        self._spent += time.perf_counter() - t0
+        return out
+
+    def draw(self, canvas, batch):
+        if batch:
+            t0 = time.perf_counter()
+            canvas.blits(batch)
+            self._spent += time.perf_counter() - t0
+
+    def clear(self):
+        self.count = 0
+
+    def stats(self):
+        return {
+            'emitted': self.emitted,
+            'culled': self.culled,
+            'limit': self.limit,
+            'cost_ms': round(self.cost * 1e3, 3),
+        }
+
+
+def bench(frames=240):
+    import random
+    from benchmark import bench_game
+
+    random.seed(5)
+    with bench_game('particles') as game:
+        game.start_game_with_difficulty('normal')
+        canvas = game.display.canvas
+        colors = [(80, 200, 150), (255, 200, 60), (255, 80, 80), (120, 230, 255)]
+
+        def run(particles, live):
+            # keep about `live` particles alive with a steady stream of bursts
+            particles.clear()
+            spent = 0.0
+            for i in range(frames):
+                t0 = time.perf_counter()
+                while particles.count < live and particles.count < particles.limit:
+                    before = particles.count
+                    particles.burst('break', 100 + (i * 37) % 700, 200 + (i * 13) % 200, colors[i % 4])
+                    if particles.count == before:
+                        break
+                particles.update(1 / 60)
+                particles.draw(canvas, particles.batch())
+                spent += time.perf_counter() - t0
+            return spent / frames * 1e3
+
+        probe = Particles(budget_ms=1e6)
+        probe.load()
+        if probe.np is None:
+            print('numpy is not installed: particles are disabled')
+            return
+        print('particles: update + batch + draw, ms/frame by live count')
+        for live in (100, 500, 1000, 2000, 4000):
+            print(f'{live:>6} {run(probe, live):8.3f}')
+        for budget in (BUDGET_MS, 0.5):
+            particles = Particles(budget_ms=budget)
+            particles.load()
+            ms = run(particles, CAPACITY)
+            print(f'budget {budget:.1f} ms, asking for {CAPACITY}: settled at {particles.limit} live, '
+                  f'{ms:.3f} ms/frame, {particles.culled} culled')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
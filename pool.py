@@ -0,0 +1,113 @@
+"""Pre-allocated entity pools.
+
+EntityPool hands out objects from a free list and takes them back on
+release, so balls, falling capsules and laser bolts are recycled instead of
+being allocated and freed during play. Live entities sit in a
+plain list with swap-remove, so neither spawning nor despawning allocates.
+
+    python pool.py --bench     # entity allocations and update cost, pooled vs unpooled
+"""
+import random
+import sys
+import time
+
+
+class EntityPool:
+    def __init__(self, factory, size, grow=True):
+        self.factory = factory
+        self.grow = grow  # when empty: allocate another (True) or refuse the spawn (False)
+        self.free = [factory() for _ in range(size)]
+        self.active = []
+        self.allocated = size
+        self.recycle = True  # False drops released objects, i.e. plain allocation (for the benchmark)
+
+    def __len__(self):
+        return len(self.active)
+
+    def acquire(self):
+        if self.free:
+            obj = self.free.pop()
+        elif self.grow:
+            obj = self.factory()
+            self.allocated += 1
+        else:
+            return None
+        obj.pool_index = len(self.active)
+        self.active.append(obj)
+        return obj
+
+    def release(self, obj):
+        active = self.active
+        i = obj.pool_index
+        if i < 0 or i >= len(active) or active[i] is not obj:
+            return  # not handed out by this pool, or already released
+        last = active.pop()
+        if last is not obj:
+            active[i] = last
+            last.pool_index = i
+        obj.pool_index = -1
+        if self.recycle:
+            self.free.append(obj)
+
+    def release_all(self):
+        for obj in self.active:
+            obj.pool_index = -1
+            if self.recycle:
+                self.free.append(obj)
+        self.active.clear()
+
+
+def bench(frames=3600):
+    """Laser firing every frame and a capsule rain: a few hundred entities live at once.
+
+    The entities hold no reference cycles, so unpooled ones are freed by
+    reference counting and never trigger the cyclic collector; the cost of
+    not pooling is the allocation itself, which is what this reports.
+    """
+    from benchmark import bench_games
+    from game import FPS, BonusCapsulesPowerUp, LaserPowerUp, MultiBallPowerUp
+
+    with bench_games('pool') as scratch:
+        def run(recycle):
+            random.seed(3)
+            game = scratch.game(headless=True)
+            for pool in (game.ball_pool, game.projectiles, game.capsules):
+                pool.recycle = recycle
+                pool.grow = pool.grow or not recycle
+            game.start_game_with_difficulty('normal')
+            pools = (game.ball_pool, game.projectiles, game.capsules)
+            allocated = sum(pool.allocated for pool in pools)
+            peak = 0
+            spent = 0.0
+            for i in range(frames):
+                if game.show_question:
+                    game.answer_question(game.current_question['answer'])
+                    game.countdown_active = False
+                if game.state != 'playing':
+                    game.start_game_with_difficulty('normal')
+                if i % 300 == 0:
+                    game.spawn_powerup(LaserPowerUp(interval=0.0))
+                    game.spawn_powerup(BonusCapsulesPowerUp())
+                    game.spawn_powerup(MultiBallPowerUp())
+                for block in game.blocks[i % 7::97]:
+                    game.drop_capsule(block)
+                game.shield_active = True
+                game.paddle_target = game.balls[0].pos.x if game.balls else 450
+                t0 = time.perf_counter()
+                game.update(1 / FPS)
+                spent += time.perf_counter() - t0
+                peak = max(peak, len(game.projectiles) + len(game.capsules) + len(game.balls))
+            allocated = sum(pool.allocated for pool in pools) - allocated
+            return peak, allocated, spent / frames
+
+        for label, recycle in (('unpooled', False), ('pooled', True)):
+            peak, allocated, per_frame = run(recycle)
+            print(f'{label:>9}: {frames} frames, <= {peak} live entities, {allocated} allocated during play '
+                  f'({allocated / frames:.1f}/frame), update {per_frame * 1e6:.0f} us/frame')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
@@ -0,0 +1,336 @@
+"""Profiling capture from a running game: cProfile, tracemalloc and a sampler.
+
+Three captures, each started from the command line or a hotkey, all writing
+into one directory (PROFILE_DIR, named by start time):
+
+cProfile over N frames of one state. The profiler is switched on only while
+the game is in that state ('playing', the 'question' modal, 'lessons', ...),
+so `--profile question --profile-frames 300` profiles 300 frames of the
+modal and nothing else. The result is a .pstats file (pstats, snakeviz) and
+a .txt summary sorted by cumulative time. F9 starts the same capture for
+whatever state the game is in, or ends a running one early.
+
+tracemalloc snapshots at level transitions. With `--trace-alloc` every new
+level (and F10) takes a snapshot, dumps it, and writes a report of the lines
+whose allocations grew most since the previous one; two dumped snapshots
+can be diffed again later with --diff.
+
+The sampler (`--profile-sample [MS]`, F11 to start or stop) is for real
+classrooms: a background thread looks at the main and simulation threads
+every MS milliseconds and counts their folded stacks (flamegraph.pl /
+speedscope format), rooted at the game state. It costs the frame little more
+than the GIL hand-overs, and unlike cProfile it also sees the simulation
+thread of --sim-thread.
+
+    python game.py --profile playing --profile-frames 600   # cProfile 600 frames of play
+    python game.py --trace-alloc                             # allocation reports per level
+    python game.py --profile-sample 5                        # sample every thread every 5 ms
+    python profiling.py --diff OLD.snapshot NEW.snapshot     # allocation report between two dumps
+    python profiling.py --bench                              # frame time under each capture
+"""
+import collections
+import os
+import sys
+import threading
+import time
+
+import pygame
+
+PROFILE_DIR = 'profiles'
+PROFILE_FRAMES = 600  # frames per cProfile capture
+SAMPLE_MS = 5.0  # sampler interval
+TRACE_DEPTH = 16  # frames kept per tracemalloc traceback; deeper is slower and bigger
+REPORT_LINES = 30
+SAMPLED_THREADS = ('MainThread', 'physibreak-sim')  # the frame's work; the writers and workers mostly wait
+STATES = ('playing', 'question', 'countdown', 'lessons', 'menu', 'difficulty_select', 'game_over')
+KEY_CPROFILE = pygame.K_F9
+KEY_SNAPSHOT = pygame.K_F10
+KEY_SAMPLER = pygame.K_F11
+
+
+def frame_state(game):
+    """The game's state as the captures name it: the modal and countdown count apart from play."""
+    if game.state == 'playing':
+        if game.show_question:
+            return 'question'
+        if game.countdown_active:
+            return 'countdown'
+    return game.state
+
+
+def _label(code):
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def alloc_report(snapshot, previous=None, limit=REPORT_LINES):
+    """Lines of text: the biggest allocation sites, or the biggest changes since `previous`."""
+    import tracemalloc
+    keep = (tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*'),
+            tracemalloc.Filter(False, '<unknown>'))
+    snapshot = snapshot.filter_traces(keep)
+    total = sum(s.size for s in snapshot.statistics('filename'))
+    lines = [f'total {total / 1024:.1f} KiB traced']
+    if previous is None:
+        lines.append(f'top {limit} lines by size')
+        lines += [str(s) for s in snapshot.statistics('lineno')[:limit]]
+    else:
+        lines.append(f'top {limit} lines by change in size')
+        lines += [str(s) for s in snapshot.compare_to(previous.filter_traces(keep), 'lineno')[:limit]]
+    return lines
+
+
+class Sampler(threading.Thread):
+    """Counts folded stacks of the SAMPLED_THREADS, every `interval` seconds."""
+    def __init__(self, game, interval):
+        super().__init__(name='physibreak-sampler', daemon=True)
+        self.game = game
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.running = True
+        self._labels = {}  # code object -> label; each code is formatted once
+
+    def run(self):
+        labels = self._labels
+        while self.running:
+            time.sleep(self.interval)
+            names = {t.ident: t.name for t in threading.enumerate() if t.name in SAMPLED_THREADS}
+            state = frame_state(self.game)
+            for ident, frame in sys._current_frames().items():
+                if ident not in names:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names[ident])
+                stack.append(state)
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self.running = False
+        self.join()
+
+
+class Profiler:
+    def __init__(self, directory=PROFILE_DIR, state=None, frames=PROFILE_FRAMES, trace_alloc=False, sample_ms=None,
+                 report=print):
+        self.directory = directory
+        self.report = report  # called with each file written; None keeps quiet
+        self.prefix = time.strftime('%Y%m%d-%H%M%S')
+        self.frames = frames
+        self.target = state  # state the cProfile capture is waiting for or running in
+        self.trace_alloc = trace_alloc
+        self.sample_ms = sample_ms
+        self.profile = None
+        self.enabled = False  # cProfile is switched on right now
+        self.counted = 0  # frames of the target state profiled so far
+        self.sampler = None
+        self.snapshot = None  # last tracemalloc snapshot, the base of the next report
+        self.snapshots = 0
+        self.written = []  # paths of every file written
+        if trace_alloc:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_DEPTH)  # right away, so the game's construction is traced too
+
+    def start(self, game):
+        """Start the sampler if it was asked for on the command line."""
+        if self.sample_ms:
+            self.start_sampler(game)
+
+    def _path(self, name):
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f'{self.prefix}-{name}')
+
+    def _wrote(self, path):
+        self.written.append(path)
+        if self.report is not None:
+            self.report(f'profiling: wrote {path}')
+
+    # cProfile
+
+    def capture(self, state):
+        import cProfile
+        self.finish()
+        self.target = state
+        self.profile = cProfile.Profile()
+        self.counted = 0
+
+    def end_frame(self, game):
+        if self.target is None:
+            return
+        if self.profile is None:
+            self.capture(self.target)
+        if self.enabled:
+            self.counted += 1
+            if self.counted >= self.frames:
+                self.finish()
+                return
+        # switched at frame boundaries: the next frame is profiled if the game is in the state now
+        wanted = frame_state(game) == self.target
+        if wanted != self.enabled:
+            if wanted:
+                self.profile.enable()
+            else:
+                self.profile.disable()
+            self.enabled = wanted
+
+    def finish(self):
+        """Write the cProfile capture, if one has profiled any frames."""
+        profile, self.profile = self.profile, None
+        target, self.target = self.target, None
+        if profile is None:
+            return
+        if self.enabled:
+            profile.disable()
+            self.enabled = False
+        if not self.counted:
+            return
+        import pstats
+        path = self._path(f'{target}-{self.counted}f')
+        profile.dump_stats(path + '.pstats')
+        with open(path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(f'{self.counted} frames of {target}\n')
+            pstats.Stats(profile, stream=f).sort_stats('cumulative').print_stats(REPORT_LINES * 2)
+        self._wrote(path + '.pstats')
+
+    # tracemalloc
+
+    def take_snapshot(self, label):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_DEPTH)  # from a hotkey: this first snapshot only sees what comes next
+        snapshot = tracemalloc.take_snapshot()
+        self.snapshots += 1
+        path = self._path(f'alloc-{self.snapshots:02d}-{label}')
+        snapshot.dump(path + '.snapshot')
+        current, peak = tracemalloc.get_traced_memory()
+        with open(path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(f'{label}: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak\n')
+            f.write('\n'.join(alloc_report(snapshot, self.snapshot)) + '\n')
+        self._wrote(path + '.txt')
+        self.snapshot = snapshot
+
+    def level_changed(self, game):
+        if self.trace_alloc:
+            self.take_snapshot(f'level{game.level}')
+
+    # sampler
+
+    def start_sampler(self, game):
+        if self.sampler is None:
+            self.sampler = Sampler(game, (self.sample_ms or SAMPLE_MS) / 1e3)
+            self.sampler.start()
+
+    def stop_sampler(self):
+        sampler, self.sampler = self.sampler, None
+        if sampler is None:
+            return
+        sampler.stop()
+        if not sampler.samples:
+            return
+        path = self._path(f'sample-{sampler.samples}')
+        with open(path + '.folded', 'w', encoding='utf-8') as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        # where the time goes, by innermost function
+        leaves = collections.Counter()
+        for stack, count in sampler.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        total = sum(leaves.values())
+        with open(path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(f'{sampler.samples} samples every {sampler.interval * 1e3:g} ms, self time by function\n')
+            for label, count in leaves.most_common(REPORT_LINES):
+                f.write(f'{count / total:7.1%} {count:>7} {label}\n')
+        self._wrote(path + '.folded')
+
+    def hotkey(self, key, game):
+        """Handle a profiling key; True if `key` was one."""
+        if key == KEY_CPROFILE:
+            if self.profile is not None:
+                self.finish()
+            else:
+                self.capture(frame_state(game))
+        elif key == KEY_SNAPSHOT:
+            self.take_snapshot(frame_state(game))
+        elif key == KEY_SAMPLER:
+            if self.sampler is not None:
+                self.stop_sampler()
+            else:
+                self.start_sampler(game)
+        else:
+            return False
+        return True
+
+    def close(self):
+        self.finish()
+        self.stop_sampler()
+
+
+def diff(old_path, new_path):
+    import tracemalloc
+    old = tracemalloc.Snapshot.load(old_path)
+    new = tracemalloc.Snapshot.load(new_path)
+    print('\n'.join(alloc_report(new, old)))
+
+
+def bench(frames=600):
+    import random
+    from benchmark import bench_games
+    from raycast import PaddleAI
+
+    with bench_games('profiling') as games:
+        game = games.game()
+        game.starting_lives = 1000
+
+        def run(profiler):
+            random.seed(3)
+            game.autopilot = PaddleAI(1.0, seed=3)
+            game.profiler = profiler
+            if profiler is not None:
+                profiler.start(game)
+            game.start_game_with_difficulty('normal')
+            spent = 0.0
+            for _ in range(frames):
+                t0 = time.perf_counter()
+                if game.show_question:
+                    game.answer_question(game.current_question['answer'])
+                game.update(1 / 60)
+                game.draw()
+                game.display.present()
+                if profiler is not None:
+                    profiler.end_frame(game)
+                spent += time.perf_counter() - t0
+            if profiler is not None:
+                profiler.close()
+                if profiler.trace_alloc:
+                    import tracemalloc
+                    tracemalloc.stop()
+            return spent / frames * 1e3
+
+        run(None)  # warm up: first-frame font, sprite and cache work
+        base = run(None)
+        print(f'{"off":>24}: {base:6.3f} ms/frame')
+        for label, kwargs in (('cProfile, all play', {'state': 'playing', 'frames': frames}),
+                              (f'sampler, {SAMPLE_MS:g} ms', {'sample_ms': SAMPLE_MS}),
+                              ('sampler, 20 ms', {'sample_ms': 20.0}),
+                              ('tracemalloc', {'trace_alloc': True})):
+            ms = run(Profiler(directory=os.path.join(games.dir, 'out'), report=None, **kwargs))
+            print(f'{label:>24}: {ms:6.3f} ms/frame ({(ms / base - 1) * 100:+.0f}%)')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    elif '--diff' in sys.argv and len(sys.argv) > sys.argv.index('--diff') + 2:
+        at = sys.argv.index('--diff')
+        diff(sys.argv[at + 1], sys.argv[at + 2])
+    else:
+        print(__doc__)
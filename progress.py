@@ -0,0 +1,200 @@
+"""Local player progress store for PhysiBreak.
+
+SQLite in WAL mode. All writes are queued and committed in batches on a
+background thread so the game loop never waits on disk; reads use their own
+connection and are meant for menus / startup, not per-frame work.
+"""
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name        TEXT PRIMARY KEY,
+    created_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id          TEXT PRIMARY KEY,
+    player      TEXT NOT NULL,
+    difficulty  TEXT,
+    started_at  REAL NOT NULL,
+    ended_at    REAL,
+    score       INTEGER NOT NULL DEFAULT 0,
+    lives       INTEGER,
+    level       INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS sessions_recent ON sessions (player, started_at DESC);
+CREATE INDEX IF NOT EXISTS sessions_high_score ON sessions (player, score DESC);
+CREATE TABLE IF NOT EXISTS answers (
+    id            INTEGER PRIMARY KEY,
+    session_id    TEXT NOT NULL,
+    player        TEXT NOT NULL,
+    question_id   INTEGER NOT NULL,
+    correct       INTEGER NOT NULL,
+    response_time REAL,
+    answered_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_accuracy ON answers (player, question_id, correct);
+CREATE INDEX IF NOT EXISTS answers_session ON answers (session_id);
+CREATE TABLE IF NOT EXISTS cards (
+    player      TEXT NOT NULL,
+    question_id INTEGER NOT NULL,
+    ease        REAL NOT NULL,
+    interval    REAL NOT NULL,
+    reps        INTEGER NOT NULL,
+    lapses      INTEGER NOT NULL,
+    due         REAL NOT NULL,
+    PRIMARY KEY (player, question_id)
+) WITHOUT ROWID;
+"""
+
+_FLUSH = object()
+_STOP = object()
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    # WAL + NORMAL only fsyncs at checkpoints; a crash can lose the last batch, never corrupt
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class ProgressStore:
+    def __init__(self, path='progress.db', batch_size=256, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._queue = queue.SimpleQueue()
+        self._reader = None
+        self.write_errors = 0  # statements dropped because they failed to commit
+        self._writer = threading.Thread(target=self._write_loop, name='progress-writer', daemon=True)
+        self._writer.start()
+
+    # ------------------------
+    # Writes (non-blocking, called from the game loop)
+    # ------------------------
+    def _put(self, sql, params):
+        self._queue.put((sql, params))
+
+    def begin_session(self, player, difficulty=None):
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        self._put('INSERT OR IGNORE INTO players (name, created_at) VALUES (?, ?)', (player, now))
+        self._put('INSERT INTO sessions (id, player, difficulty, started_at) VALUES (?, ?, ?, ?)',
+                  (session_id, player, difficulty, now))
+        return session_id
+
+    def end_session(self, session_id, score, lives, level):
+        self._put('UPDATE sessions SET ended_at = ?, score = ?, lives = ?, level = ? WHERE id = ?',
+                  (time.time(), score, lives, level, session_id))
+
+    def record_answer(self, session_id, player, question_id, correct, response_time=None):
+        self._put('INSERT INTO answers (session_id, player, question_id, correct, response_time, answered_at) '
+                  'VALUES (?, ?, ?, ?, ?, ?)',
+                  (session_id, player, question_id, int(correct), response_time, time.time()))
+
+    def save_card(self, player, card):
+        self._put('INSERT OR REPLACE INTO cards (player, question_id, ease, interval, reps, lapses, due) '
+                  'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                  (player, card.qid, card.ease, card.interval, card.reps, card.lapses, card.due))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is committed."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self):
+        self._queue.put((_STOP, None))
+        self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        running = True
+        while running:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+            deadline = time.monotonic() + self.flush_interval
+            # gather a batch: whatever is already queued, up to batch_size or flush_interval
+            while True:
+                sql, params = item
+                if sql is _STOP:
+                    running = False
+                    break
+                if sql is _FLUSH:
+                    waiters.append(params)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit(conn, batch)
+            for done in waiters:
+                done.set()
+        conn.close()
+
+    def _commit(self, conn, batch):
+        try:
+            with conn:  # rolls the batch back if a statement fails
+                for sql, params in batch:
+                    conn.execute(sql, params)
+            return
+        except Exception:
+            pass
+        # replay one statement per transaction so only the failing ones are lost
+        error = None
+        dropped = 0
+        for sql, params in batch:
+            try:
+                with conn:
+                    conn.execute(sql, params)
+            except Exception as e:
+                error = e
+                dropped += 1
+        if dropped:
+            self.write_errors += dropped
+            print(f'progress: dropped {dropped} of {len(batch)} writes: {error.__class__.__name__}: {error}',
+                  file=sys.stderr)
+
+    # ------------------------
+    # Reads (indexed; use outside of gameplay frames)
+    # ------------------------
+    def _read(self, sql, params=()):
+        if self._reader is None:
+            self._reader = _connect(self.path)
+        return self._reader.execute(sql, params).fetchall()
+
+    def recent_sessions(self, player, limit=10):
+        return self._read('SELECT id, difficulty, started_at, ended_at, score, lives, level FROM sessions '
+                          'WHERE player = ? ORDER BY started_at DESC LIMIT ?', (player, limit))
+
+    def high_scores(self, player, limit=10):
+        return self._read('SELECT score, level, difficulty, started_at FROM sessions '
+                          'WHERE player = ? ORDER BY score DESC LIMIT ?', (player, limit))
+
+    def question_accuracy(self, player):
+        """[(question_id, attempts, correct)] answered from the covering index alone."""
+        return self._read('SELECT question_id, COUNT(*), SUM(correct) FROM answers '
+                          'WHERE player = ? GROUP BY question_id ORDER BY question_id', (player,))
+
+    def load_cards(self, player):
+        return self._read('SELECT question_id, ease, interval, reps, lapses, due FROM cards WHERE player = ?',
+                          (player,))
+
+    def players(self):
+        return [row[0] for row in self._read('SELECT name FROM players ORDER BY name')]
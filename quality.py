@@ -0,0 +1,231 @@
+"""Quality tiers: trading visuals for frame time on weak machines.
+
+A tier sets the dimmed overlay behind the question modal, the particle
+budget, the number of mixer channels and the resolution the play field is
+drawn at (surface backends; see display.py). A fixed render scale from the
+command line is left alone. Rounded corners are not a setting: with pygame
+2.6 a filled rect with border_radius=0 measured about three times slower
+than the same rect with rounded corners, so square blocks would cost frames.
+
+'auto' starts at 'high' and calibrates while the menu is up: each menu frame
+spends a slice of its spare time drawing a synthetic play frame per tier on
+an offscreen surface, for CALIBRATE_SECONDS, and the best tier whose p95
+fits DRAW_SHARE of the frame budget is picked. Nothing of this runs before
+the first menu frame, so cold start is unchanged. During play the p95 of
+real frame times (events to present, not counting the wait for the next
+tick) is checked every CHECK_EVERY frames; over the budget, the game drops
+one tier. It never climbs back during a run: a tier that was too slow once
+usually is again, and flipping back and forth is worse than either.
+
+    python quality.py --bench     # calibration on this machine, draw cost per tier, auto mode on a loaded frame
+"""
+import collections
+import sys
+import time
+
+import pygame
+
+from display import SurfaceCanvas
+
+ORDER = ('low', 'medium', 'high')
+# tier -> (dimmed question overlay, particle budget in ms, mixer channels, render scale)
+# a render scale between 0.5 and 1 costs more than it saves: the upscale is no longer a plain doubling
+TIERS = {
+    'high': (True, 1.5, 16, 1.0),
+    'medium': (False, 0.75, 8, 1.0),
+    'low': (False, 0.3, 4, 0.5),
+}
+FRAME_BUDGET = 1 / 60  # s; a frame that takes longer drops one
+WINDOW = 180  # play frames the p95 is taken over
+CHECK_EVERY = 60  # frames between looks at the p95
+DRAW_SHARE = 0.4  # share of the budget a calibration frame may take; the rest is events, physics and present
+CALIBRATE_SECONDS = 3.0  # wall time calibration is spread over
+CALIBRATE_SLICE = 0.004  # s of each menu frame given to it
+CALIBRATE_SAMPLES = 60  # per tier; calibration stops early once every tier has them
+
+
+def p95(samples):
+    ordered = sorted(samples)
+    return ordered[int(len(ordered) * 0.95)]
+
+
+class Calibration:
+    """Times a synthetic play frame for every tier on an offscreen surface, a slice at a time."""
+    def __init__(self, size):
+        w, h = size
+        self.surface = pygame.Surface(size).convert()
+        self.canvases = {name: SurfaceCanvas(self.surface, TIERS[name][3]) for name in ORDER}
+        self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self.overlay.fill((10, 10, 10, 200))
+        # a level-one field: 6 rows of 72x28 blocks across the width, three balls, the paddle
+        self.blocks = [((x, 80 + row * 36, 72, 28), (80, 200 - row * 20, 150))
+                       for row in range(6) for x in range(50, w - 72, 80)]
+        self.balls = [(w // 3, h // 2), (w // 2, h // 2 + 60), (2 * w // 3, h // 2 - 40)]
+        self.paddle = (w // 2 - 60, h - 60, 120, 18)
+        self.samples = {name: [] for name in ORDER}
+        self.started = None
+
+    def draw(self, name):
+        overlay = TIERS[name][0]
+        canvas = self.canvases[name]
+        canvas.clear((22, 22, 30))
+        canvas.begin_field()
+        for rect, color in self.blocks:
+            canvas.rect(color, rect, 6)
+        canvas.rect((40, 120, 200), self.paddle, 8)
+        for center in self.balls:
+            canvas.circle((230, 50, 50), center, 9)
+        canvas.end_field()
+        if overlay:
+            self.surface.blit(self.overlay, (0, 0))
+
+    def step(self, seconds=CALIBRATE_SLICE):
+        """Spend about `seconds` drawing; True once calibration is complete."""
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        until = now + seconds
+        while time.perf_counter() < until:
+            for name in ORDER:
+                t0 = time.perf_counter()
+                self.draw(name)
+                self.samples[name].append(time.perf_counter() - t0)
+        return (time.perf_counter() - self.started >= CALIBRATE_SECONDS
+                or all(len(s) >= CALIBRATE_SAMPLES for s in self.samples.values()))
+
+    def choose(self):
+        """The best tier whose calibration frames fit DRAW_SHARE of the budget; None without samples."""
+        if not all(self.samples.values()):
+            return None
+        for name in reversed(ORDER):
+            if p95(self.samples[name]) <= FRAME_BUDGET * DRAW_SHARE:
+                return name
+        return ORDER[0]
+
+
+class Quality:
+    def __init__(self, tier='auto', render_scale=None):
+        if tier != 'auto' and tier not in TIERS:
+            raise ValueError(f'unknown quality tier {tier!r}')
+        self.auto = tier == 'auto'
+        self.fixed_scale = render_scale  # set by the player: tiers leave the render scale alone
+        self.calibration = None  # made on the first menu frame in auto mode
+        self.calibrated = not self.auto
+        self.frames = collections.deque(maxlen=WINDOW)  # seconds per play frame
+        self.checked = 0  # frames since the p95 was last looked at
+        self.changes = []  # (tier, reason, p95 in ms or None) for every tier set after the first
+        self.tier = None
+        self.set_tier('high' if self.auto else tier)
+
+    def set_tier(self, tier):
+        self.tier = tier
+        self.overlay, self.particle_ms, self.channels, scale = TIERS[tier]
+        self.render_scale = scale if self.fixed_scale is None else self.fixed_scale
+
+    def apply(self, game):
+        """Push the tier's settings into the game's particles, mixer and display."""
+        game.particles.budget = self.particle_ms / 1e3
+        self.apply_mixer()
+        if not game.headless and hasattr(game.display.canvas, 'set_render_scale'):
+            if game.display.canvas.render_scale != self.render_scale:
+                game.display.canvas.set_render_scale(self.render_scale)
+
+    def apply_mixer(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.set_num_channels(self.channels)
+
+    def change(self, game, tier, reason, p95_s=None):
+        ms = None if p95_s is None else round(p95_s * 1e3, 2)
+        self.set_tier(tier)
+        self.apply(game)
+        self.changes.append((tier, reason, ms))
+        game.telemetry.emit('quality', tier=tier, reason=reason, p95_ms=ms)
+
+    def end_frame(self, game, seconds):
+        """Call after every presented frame with the time it took, not counting the wait for the next tick."""
+        if not self.auto or game.headless:
+            return
+        if not game.in_play():
+            if not self.calibrated and game.state == 'menu':
+                if self.calibration is None:
+                    self.calibration = Calibration(game.display.surface.get_size())
+                if self.calibration.step():
+                    self.finish_calibration(game)
+            return
+        if not self.calibrated:
+            self.finish_calibration(game)  # the game started first: go with what was measured so far
+        self.frames.append(seconds)
+        self.checked += 1
+        if self.checked >= CHECK_EVERY and len(self.frames) == WINDOW:
+            self.checked = 0
+            slow = p95(self.frames)
+            if slow > FRAME_BUDGET and self.tier != ORDER[0]:
+                self.change(game, ORDER[ORDER.index(self.tier) - 1], 'p95', slow)
+                self.frames.clear()
+
+    def finish_calibration(self, game):
+        self.calibrated = True
+        calibration, self.calibration = self.calibration, None
+        tier = calibration.choose() if calibration is not None else None
+        if tier is not None and tier != self.tier:
+            self.change(game, tier, 'calibration', p95(calibration.samples[self.tier]))
+
+    def stats(self):
+        return {'tier': self.tier, 'auto': self.auto, 'changes': len(self.changes)}
+
+
+def bench(frames=120):
+    import random
+    from benchmark import bench_game
+    from display import record_scenes
+
+    random.seed(12)
+    with bench_game('quality', quality='high') as game:
+        calibration = Calibration(game.display.surface.get_size())
+        steps = 1
+        while not calibration.step():
+            steps += 1
+        print(f'calibration: {steps} menu frames, budget {FRAME_BUDGET * DRAW_SHARE * 1e3:.1f} ms per synthetic frame')
+        for name in reversed(ORDER):
+            print(f'{name:>8}: p95 {p95(calibration.samples[name]) * 1e3:6.3f} ms '
+                  f'({len(calibration.samples[name])} frames)')
+        print(f'  chosen: {calibration.choose()}')
+
+        scenes = record_scenes(game, frames=60)
+        print('draw + present of recorded scenes, ms/frame')
+        print(f'{"":>8}' + ''.join(f'{scene:>17}' for scene in scenes))
+        for name in reversed(ORDER):
+            game.quality.set_tier(name)
+            game.quality.apply(game)
+            row = []
+            for views in scenes.values():
+                game.draw(views[0])  # fill caches first
+                t0 = time.perf_counter()
+                for i in range(frames):
+                    game.draw(views[i % len(views)])
+                    game.display.present()
+                row.append((time.perf_counter() - t0) / frames * 1e3)
+            print(f'{name:>8}' + ''.join(f'{ms:17.3f}' for ms in row))
+
+        # auto mode on a machine that needs 20 ms per frame at 'high' and less per tier below
+        game.quality = Quality('auto')
+        game.quality.calibrated = True
+        game.start_game_with_difficulty('normal')
+        cost = {'high': 0.020, 'medium': 0.014, 'low': 0.010}
+        played = 0
+        while played < 1200:
+            game.show_question = False
+            game.countdown_active = False
+            game.update(1 / 60)
+            played += 1
+            game.quality.end_frame(game, cost[game.quality.tier] * random.uniform(0.9, 1.1))
+        for tier, reason, ms in game.quality.changes:
+            print(f'auto: dropped to {tier} ({reason} {ms} ms)')  # reason 'p95' or 'calibration', both a p95
+        print(f'auto: settled at {game.quality.tier} after {played} frames')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
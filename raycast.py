@@ -0,0 +1,517 @@
+"""Ball trajectory prediction and the AI paddle.
+
+cast() follows a ball from where it is to the paddle line without stepping
+frames. Each straight run ends at the first side wall, the ceiling or the
+paddle line, worked out in closed form; within it a DDA walk over the block
+lattice (BlockGrid) visits only the cells the ray passes through and tests
+the blocks registered there, so the nearest block hit costs a few cells, not
+a scan of the level. A hit reflects the ball the way update() does (off the
+face it entered by) and a block that would break is left out of the rest of
+the cast. Once the ball is heading down below the lowest block, the side
+walls are folded in closed form: the crossing x is the straight-line x
+reflected back into [radius, width - radius], however many bounces that is.
+
+Block hits are tested against the same four points of the ball update()
+checks, and bounce on the axis it would pick. update() works in whole frames
+and clamps a ball to the wall instead of mirroring it, so a prediction can
+still be off by up to a frame of travel per bounce.
+
+PaddleAI drives a paddle with it, for headless runs, demos and attract mode
+(PhysiBreakGame.autopilot, --autopilot). skill sets how many bounces it
+reads ahead, how often it re-decides and how far off centre it takes the
+ball, to send it toward the blocks that are left (a dead-centre catch sends
+it straight back up, over and over); error
+is the spread, in pixels per second of look-ahead, of the noise added to
+where it aims.
+
+AimPreview turns the same cast into the dotted aim-assist line of the easy
+difficulty: the ball's next few bounces off walls, blocks and the paddle
+where it is now. A ball's path is cast once and reused while its velocity
+and the block field stay the same (the dots slide along it as the ball
+moves); a streamed level scrolling its blocks down counts as a new field.
+Only the leg after the paddle is recast when the paddle moves.
+
+    python raycast.py --bench     # prediction error, us per decision, headless games steered by PaddleAI,
+                                  # and preview cost with and without the cache
+"""
+import math
+import random
+import sys
+import time
+
+MARGIN = 18  # blocks are registered in every cell within this many px, for balls up to this radius
+MAX_BOUNCES = 12
+SLOWEST_REACTION = 12  # ticks between decisions at skill 0
+PREVIEW_BOUNCES = 4  # bounces AimPreview follows, the paddle included
+PREVIEW_LENGTH = 480.0  # px of path shown ahead of the ball
+DOT_SPACING = 16.0
+PADDLE_ANGLE = math.radians(75)  # steepest paddle bounce, as in update()
+AIM = 0.5  # at skill 1, how far off the paddle centre (in half-widths) it takes the ball, to send it sideways
+EPS = 1e-6
+
+
+def fold(x, lo, hi):
+    """x after straight-line travel between walls at lo and hi, reflected back into [lo, hi]."""
+    span = hi - lo
+    if span <= 0:
+        return lo
+    u = (x - lo) % (2 * span)
+    return lo + (u if u <= span else 2 * span - u)
+
+
+def lattice(game):
+    """(screen width, cell width, cell height): the field and the pitch of its block lattice,
+    from the geometry the game builds its levels with (levels.LevelPipeline)."""
+    g = game.levels.geometry
+    return g['screen_width'], g['block_w'] + g['pad'], g['block_h'] + g['pad']
+
+
+def scrolled(game):
+    """Pixels a streamed level has moved its blocks down in place (levels.LevelStream.shifted), else 0."""
+    stream = game.level_stream
+    return 0 if stream is None else stream.shifted
+
+
+class BlockGrid:
+    """The blocks of one level, bucketed by lattice cell; rebuilt when the block list is replaced
+    or a streamed level scrolls them."""
+    def __init__(self, blocks, cell_w, cell_h, shifted=0):
+        self.blocks = blocks
+        self.shifted = shifted
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.cells = {}
+        bottom = -math.inf
+        for block in blocks:
+            r = block.rect
+            for col in range(int(r.left - MARGIN) // cell_w, int(r.right + MARGIN) // cell_w + 1):
+                for row in range(int(r.top - MARGIN) // cell_h, int(r.bottom + MARGIN) // cell_h + 1):
+                    self.cells.setdefault((col, row), []).append(block)
+            bottom = max(bottom, r.bottom)
+        self.bottom = bottom + MARGIN  # below this a ball meets no block
+
+    def first_hit(self, x, y, vx, vy, t_end, radius, gone=()):
+        """(t, block, 'x' or 'y' face) of the first block the ray hits before t_end, or None."""
+        cell_w, cell_h = self.cell_w, self.cell_h
+        col, row = int(x // cell_w), int(y // cell_h)
+        step_c = 1 if vx > 0 else -1
+        step_r = 1 if vy > 0 else -1
+        # t at which the ray crosses the next column / row boundary, and per cell after that
+        if vx:
+            next_c = ((col + (vx > 0)) * cell_w - x) / vx
+            delta_c = cell_w / abs(vx)
+        else:
+            next_c = delta_c = math.inf
+        if vy:
+            next_r = ((row + (vy > 0)) * cell_h - y) / vy
+            delta_r = cell_h / abs(vy)
+        else:
+            next_r = delta_r = math.inf
+        cells = self.cells
+        best = None
+        best_t = t_end
+        seen = set()
+        t_cell = 0.0
+        while t_cell <= best_t:
+            for block in cells.get((col, row), ()):
+                if block in seen:
+                    continue
+                seen.add(block)
+                if not block.alive or block in gone or getattr(block, 'frozen', False):
+                    continue
+                hit = _enter(block.rect, radius, x, y, vx, vy)
+                if hit is not None and hit[0] < best_t:
+                    best_t = hit[0]
+                    best = (hit[0], block, hit[1])
+            # on to the next cell along the ray
+            if next_c < next_r:
+                t_cell = next_c
+                next_c += delta_c
+                col += step_c
+            else:
+                t_cell = next_r
+                next_r += delta_r
+                row += step_r
+        return best
+
+
+def _enter(rect, radius, x, y, vx, vy):
+    # update() tests the ball's left, right, top and bottom points: that is the rect grown sideways by the
+    # radius, or grown up and down by it (not the corners of both). (t of entry, axis it bounces on) or None
+    left, right, top, bottom = rect.left, rect.right, rect.top, rect.bottom
+    wide = _slab(left - radius, right + radius, top, bottom, x, y, vx, vy)
+    tall = _slab(left, right, top - radius, bottom + radius, x, y, vx, vy)
+    if wide is None:
+        if tall is None:
+            return None
+        t = tall
+    else:
+        t = wide if tall is None or wide < tall else tall
+    # and it bounces the way update() decides, from how far the centre is outside the rect on each axis
+    hx, hy = x + vx * t, y + vy * t
+    ox = hx - max(left, min(hx, right))
+    oy = hy - max(top, min(hy, bottom))
+    return t, ('x' if abs(ox) > abs(oy) else 'y')
+
+
+def _slab(left, right, top, bottom, x, y, vx, vy):
+    # t at which the ray enters the box, or None if it misses it or starts inside
+    if vx:
+        t1, t2 = (left - x) / vx, (right - x) / vx
+        tx0, tx1 = (t1, t2) if t1 < t2 else (t2, t1)
+    elif left <= x < right:
+        tx0, tx1 = -math.inf, math.inf
+    else:
+        return None
+    if vy:
+        t1, t2 = (top - y) / vy, (bottom - y) / vy
+        ty0, ty1 = (t1, t2) if t1 < t2 else (t2, t1)
+    elif top <= y < bottom:
+        ty0, ty1 = -math.inf, math.inf
+    else:
+        return None
+    t0 = tx0 if tx0 > ty0 else ty0
+    t1 = tx1 if tx1 < ty1 else ty1
+    if t0 > t1 or t0 < -EPS:
+        return None
+    return t0
+
+
+def _breaks(block):
+    return getattr(block, 'question_id', None) is None and block.hits <= 1
+
+
+def cast(grid, x, y, vx, vy, radius, width, line_y, bounces=MAX_BOUNCES, path=None):
+    """Follow a ball to the paddle line: (x where it gets there, frames until then), or None.
+
+    Velocities are in px per frame, as Ball keeps them. None means it had not
+    come down within `bounces` reflections. With a `path` list, the start and
+    every bounce point are appended to it.
+    """
+    if not vx and not vy:
+        return None
+    lo, hi = radius, width - radius
+    gone = set()
+    t_total = 0.0
+    if path is not None:
+        path.append((x, y))
+    for _ in range(bounces + 1):
+        if vy > 0 and y >= grid.bottom:
+            t = (line_y - y) / vy  # nothing but the side walls from here down
+            end_x = fold(x + vx * t, lo, hi)
+            if path is not None:
+                _fold_path(path, x, y, vx, vy, t, lo, hi)
+                path.append((end_x, line_y))
+            return end_x, t_total + t
+        # closed-form end of this straight run
+        t_end, wall = math.inf, None
+        if vx > 0:
+            t_end, wall = (hi - x) / vx, 'x'
+        elif vx < 0:
+            t_end, wall = (lo - x) / vx, 'x'
+        if vy < 0 and (radius - y) / vy < t_end:
+            t_end, wall = (radius - y) / vy, 'y'
+        elif vy > 0 and (line_y - y) / vy <= t_end:
+            t_end, wall = (line_y - y) / vy, 'line'
+        t_end = max(t_end, 0.0)
+        hit = grid.first_hit(x, y, vx, vy, t_end, radius, gone)
+        if hit is not None:
+            t_end, block, wall = hit
+            if _breaks(block):
+                gone.add(block)
+        x += vx * t_end
+        y += vy * t_end
+        t_total += t_end
+        if wall == 'line':
+            if path is not None:
+                path.append((x, y))
+            return x, t_total
+        if wall == 'x':
+            vx = -vx
+        elif wall == 'y':
+            vy = -vy
+        if path is not None:
+            path.append((x, y))
+    return None
+
+
+def _fold_path(path, x, y, vx, vy, t, lo, hi):
+    # wall bounce points on the way down, for previews
+    while vx:
+        t_wall = ((hi if vx > 0 else lo) - x) / vx
+        if t_wall >= t:
+            return
+        x += vx * t_wall
+        y += vy * t_wall
+        t -= t_wall
+        vx = -vx
+        path.append((x, y))
+
+
+def _dots(path, s0=0.0):
+    # (distance along the path, x, y) every DOT_SPACING px of the polyline, counting from s0
+    dots = []
+    s = s0
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length:
+            d = -s % DOT_SPACING  # to the next multiple of the spacing
+            while d < length:
+                k = d / length
+                dots.append((s + d, x0 + (x1 - x0) * k, y0 + (y1 - y0) * k))
+                d += DOT_SPACING
+        s += length
+    return dots, s
+
+
+def off_paddle(x, vx, vy, paddle):
+    """Velocity after the paddle at `paddle` catches a ball at x, as update() computes it; None if it misses."""
+    rect = paddle.rect
+    if not rect.left <= x < rect.right:
+        return None
+    rel = max(-1.0, min(1.0, (x - paddle.x) / (paddle.width / 2)))
+    speed = math.hypot(vx, vy)
+    return math.sin(rel * PADDLE_ANGLE) * speed, -abs(math.cos(rel * PADDLE_ANGLE) * speed)
+
+
+class AimPreview:
+    def __init__(self, bounces=PREVIEW_BOUNCES, length=PREVIEW_LENGTH):
+        self.bounces = bounces
+        self.length = length
+        self.grid = None
+        self.width = 0
+        self.paths = {}  # ball -> [velocity and field it was cast for, start, dots, end at the paddle line, tail]
+        self.casts = 0
+        self.cached = True  # False casts every frame (for the benchmark)
+
+    def dots(self, game):
+        """[(x, y)] of the dots to draw ahead of every ball."""
+        blocks = game.blocks
+        shifted = scrolled(game)
+        if self.grid is None or self.grid.blocks is not blocks or self.grid.shifted != shifted:
+            self.width, cell_w, cell_h = lattice(game)
+            self.grid = BlockGrid(blocks, cell_w, cell_h, shifted)
+            self.paths.clear()
+        # what a cast depends on besides the ball: which blocks are there to bounce off, and where
+        field = 0
+        for b in blocks:
+            if b.alive:
+                field += 2 if getattr(b, 'frozen', False) else 1
+        paddle = game.paddle
+        paths = {}
+        out = []
+        for ball in game.balls:
+            vx, vy, r = ball.vel.x, ball.vel.y, ball.radius
+            key = (vx, vy, r, field, shifted)
+            entry = self.paths.get(ball) if self.cached else None
+            if entry is None or entry[0] != key:
+                path = []
+                hit = cast(self.grid, ball.pos.x, ball.pos.y, vx, vy, r, self.width, paddle.rect.top - r,
+                           self.bounces, path)
+                dots, s = _dots(path)
+                end = None
+                if hit is not None:
+                    fx, fy = path[-2]
+                    # velocity on the last leg, to bounce off the paddle with
+                    end = (hit[0], s, len(path) - 2, hit[0] - fx, path[-1][1] - fy)
+                entry = [key, (ball.pos.x, ball.pos.y), dots, end, None]
+                self.casts += 1
+            paths[ball] = entry
+            travelled = math.hypot(ball.pos.x - entry[1][0], ball.pos.y - entry[1][1]) + r  # from its edge
+            limit = travelled + self.length
+            shown = entry[2]
+            end = entry[3]
+            if end is not None and end[1] < limit:
+                shown = shown + self._tail(entry, paddle, r)
+            for s, x, y in shown:
+                if s > limit:
+                    break
+                if s > travelled:
+                    out.append((int(x), int(y)))
+        self.paths = paths  # balls that are gone drop out
+        return out
+
+    def _tail(self, entry, paddle, radius):
+        # the leg after the paddle, recast only when the paddle has moved
+        key = tuple(paddle.rect)
+        tail = entry[4]
+        if tail is None or tail[0] != key or not self.cached:
+            x, s, used, dx, dy = entry[3]
+            speed = math.hypot(*entry[0][:2])
+            norm = math.hypot(dx, dy) or 1.0
+            bounced = off_paddle(x, dx / norm * speed, dy / norm * speed, paddle)
+            dots = []
+            if bounced is not None and used < self.bounces:
+                path = []
+                line_y = paddle.rect.top - radius
+                cast(self.grid, x, line_y, bounced[0], bounced[1], radius, self.width, line_y,
+                     self.bounces - used - 1, path)
+                dots, _ = _dots(path, s)
+                self.casts += 1
+            tail = entry[4] = (key, dots)
+        return tail[1]
+
+
+class PaddleAI:
+    def __init__(self, skill=1.0, error=0.0, seed=None):
+        self.skill = max(0.0, min(1.0, skill))
+        self.error = error
+        self.rng = random.Random(seed)  # never the game's `random`: replays stay reproducible
+        self.bounces = 1 + round(self.skill * (MAX_BOUNCES - 1))
+        self.period = 1 + round((1.0 - self.skill) * (SLOWEST_REACTION - 1))
+        self.grid = None
+        self.width = 0
+        self.target = None
+        self._wait = 0
+        self.decisions = 0
+
+    def decide(self, game):
+        """x the paddle should head for this tick."""
+        if self._wait > 0 and self.target is not None:
+            self._wait -= 1
+            return self.target
+        self._wait = self.period - 1
+        self.decisions += 1
+        shifted = scrolled(game)
+        if self.grid is None or self.grid.blocks is not game.blocks or self.grid.shifted != shifted:
+            self.width, cell_w, cell_h = lattice(game)
+            self.grid = BlockGrid(game.blocks, cell_w, cell_h, shifted)
+        paddle = game.paddle
+        width = self.width
+        best = None
+        for ball in game.balls:
+            line_y = paddle.rect.top - ball.radius
+            hit = cast(self.grid, ball.pos.x, ball.pos.y, ball.vel.x, ball.vel.y, ball.radius, width, line_y,
+                       self.bounces)
+            if hit is not None and (best is None or hit[1] < best[1]):
+                best = hit
+        if best is None:
+            # nothing comes down within the bounces it reads: stay under the lowest ball
+            x = max(game.balls, key=lambda b: b.pos.y).pos.x if game.balls else paddle.x
+        else:
+            x, frames = best
+            # meet it off centre, so it goes back up toward where the blocks are left
+            live = [b.rect.centerx for b in game.blocks if b.alive]
+            aim_x = sum(live) / len(live) if live else width / 2
+            x -= (1 if x < aim_x else -1) * self.skill * AIM * paddle.width / 2
+            if self.error:
+                x += self.rng.gauss(0.0, self.error * frames / 60.0)
+        self.target = max(0.0, min(width, x))
+        return self.target
+
+
+def bench(samples=2000, games=6, ticks=7200):
+    import statistics
+    from benchmark import bench_games
+    from game import FPS
+
+    with bench_games('raycast') as scratch:
+        # prediction error: predict a catch, then let the simulation get there
+        # (wrong answers: a reward power-up such as the laser would reshape the field mid-flight)
+        random.seed(3)
+        game = scratch.game(headless=True)
+        game.start_game_with_difficulty('normal')
+        ai = PaddleAI()
+        errors = []
+        states = []
+        pending = None  # (ball, predicted x)
+        while len(errors) < 300:
+            if game.show_question:
+                game.answer_question((game.current_question['answer'] + 1) % len(game.current_question['choices']))
+            if game.state != 'playing':
+                game.start_game_with_difficulty('normal')
+            game.paddle_target = ai.decide(game)
+            ball = game.balls[0]
+            if pending is None and ball.vel.y < 0 and not game.countdown_active:
+                hit = cast(ai.grid, ball.pos.x, ball.pos.y, ball.vel.x, ball.vel.y, ball.radius,
+                           ai.width, game.paddle.rect.top - ball.radius)
+                if hit is not None:
+                    pending = (ball, hit[0])
+                    states.append((ball.pos.x, ball.pos.y, ball.vel.x, ball.vel.y))
+            before = ball.vel.y
+            game.update(1 / FPS)
+            if pending is not None:
+                tracked, predicted = pending
+                if tracked is not ball or tracked not in game.balls:
+                    pending = None
+                elif before > 0 and tracked.vel.y < 0 and tracked.pos.y > game.paddle.rect.top - 3 * tracked.radius:
+                    errors.append(abs(tracked.pos.x - predicted))
+                    pending = None
+        # a path with several block bounces can end up anywhere after a one-frame difference in one of them;
+        # PaddleAI re-decides as the ball comes down, so the share that lands close matters more than the tail
+        close = sum(e <= 30 for e in errors) / len(errors)
+        print(f'prediction made as the ball leaves the paddle, over {len(errors)} catches: '
+              f'median error {statistics.median(errors):.1f} px, {close:.0%} within 30 px')
+
+        # cost per decision, on ball states met in play
+        grid, width = ai.grid, ai.width
+        line_y = game.paddle.rect.top - game.ball.radius
+        t0 = time.perf_counter()
+        n = 0
+        while n < samples:
+            for x, y, vx, vy in states:
+                cast(grid, x, y, vx, vy, game.ball.radius, width, line_y)
+                n += 1
+        per = (time.perf_counter() - t0) / n
+        print(f'cast(): {per * 1e6:.1f} us per prediction, {1 / per:,.0f} predictions/s')
+
+        # whole headless games steered by the AI
+        for skill, error in ((1.0, 0.0), (0.6, 40.0), (0.2, 120.0)):
+            random.seed(11)
+            cleared = lost = broken = 0
+            decisions = 0
+            t0 = time.perf_counter()
+            for g in range(games):
+                game = scratch.game(headless=True)
+                game.start_game_with_difficulty('normal')
+                game.autopilot = PaddleAI(skill, error, seed=g)
+                level = game.level
+                for _ in range(ticks):
+                    if game.show_question:
+                        game.answer_question(game.current_question['answer'])  # right: a wrong one would speed the ball up
+                    if game.state != 'playing':
+                        break
+                    lives = game.lives
+                    blocks = game.blocks
+                    alive = sum(b.alive for b in blocks)
+                    game.update(1 / FPS)
+                    lost += game.lives < lives
+                    if game.blocks is blocks:
+                        broken += alive - sum(b.alive for b in blocks)
+                cleared += game.level - level
+                decisions += game.autopilot.decisions
+            wall = time.perf_counter() - t0
+            print(f'skill {skill:.1f}, error {error:>5.1f}: {games * ticks / wall:8.0f} ticks/s, '
+                  f'{decisions / wall:8.0f} decisions/s; {broken} blocks broken, {lost} lives lost, {cleared} levels cleared '
+                  f'in {games} games of up to {ticks / FPS:.0f} s')
+
+        # aim-assist preview per frame, on an easy game the AI plays (so the paddle keeps moving)
+        for cached in (False, True):
+            random.seed(6)
+            game = scratch.game(headless=True)
+            game.start_game_with_difficulty('easy')
+            game.autopilot = PaddleAI(0.8, 20.0, seed=1)
+            preview = AimPreview()
+            preview.cached = cached
+            spent = 0.0
+            frames = 0
+            for _ in range(ticks):
+                if game.show_question:
+                    game.answer_question(game.current_question['answer'])
+                if game.state != 'playing':
+                    break
+                game.update(1 / FPS)
+                if game.in_play():
+                    t0 = time.perf_counter()
+                    preview.dots(game)
+                    spent += time.perf_counter() - t0
+                    frames += 1
+            print(f'preview {"cached" if cached else "cast every frame"}: {spent / frames * 1e6:6.1f} us/frame, '
+                  f'{preview.casts / frames:.2f} casts/frame over {frames} frames')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
@@ -0,0 +1,164 @@
+"""Fixed-memory rewind buffer of recent game states.
+
+Every recorded tick is a snapshot (see snapshot.py) stored as the 64-byte
+chunks that changed since the previous tick, with a full keyframe every
+KEYFRAME_EVERY ticks or whenever the snapshot size changes. Restoring a
+tick replays at most KEYFRAME_EVERY - 1 chunk deltas onto a keyframe, so
+any point in the buffer loads in well under a millisecond.
+
+    python rewind.py --bench     # per-frame overhead against the plain update() loop
+"""
+import collections
+import sys
+import time
+
+from snapshot import load_snapshot, save_snapshot
+
+CHUNK = 64
+KEYFRAME_EVERY = 30
+_DELTA_OVERHEAD = 16  # rough per-chunk bookkeeping cost, for the memory cap
+
+
+def _diff(prev, cur):
+    changes = []
+    for off in range(0, len(cur), CHUNK):
+        piece = cur[off:off + CHUNK]
+        if piece != prev[off:off + CHUNK]:
+            changes.append((off, piece))
+    return changes
+
+
+def _frame_bytes(frame):
+    if frame[1] is not None:
+        return len(frame[1])
+    return sum(len(piece) + _DELTA_OVERHEAD for _, piece in frame[2])
+
+
+class RewindBuffer:
+    def __init__(self, seconds=5.0, fps=60, max_bytes=1 << 20, keyframe_every=KEYFRAME_EVERY):
+        self.max_frames = int(seconds * fps)
+        self.max_bytes = max_bytes
+        self.keyframe_every = keyframe_every
+        # (tick, keyframe bytes or None, [(offset, chunk)] for deltas)
+        self.frames = collections.deque()
+        self.bytes_used = 0
+        self.tick = 0  # number of the next recorded tick
+        self._prev = None
+        self._since_key = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def clear(self):
+        self.frames.clear()
+        self.bytes_used = 0
+        self._prev = None
+        self._since_key = 0
+
+    def oldest(self):
+        return self.frames[0][0] if self.frames else None
+
+    def record(self, game):
+        data = save_snapshot(game)
+        prev = self._prev
+        if prev is None or len(prev) != len(data) or self._since_key >= self.keyframe_every - 1:
+            frame = (self.tick, data, None)
+            self._since_key = 0
+        else:
+            frame = (self.tick, None, _diff(prev, data))
+            self._since_key += 1
+        self._prev = data
+        self.frames.append(frame)
+        self.bytes_used += _frame_bytes(frame)
+        self.tick += 1
+        while len(self.frames) > self.max_frames or (self.bytes_used > self.max_bytes and len(self.frames) > 1):
+            self._evict()
+        return frame[0]
+
+    def _evict(self):
+        old = self.frames.popleft()
+        self.bytes_used -= _frame_bytes(old)
+        if self.frames and self.frames[0][1] is None:
+            # the new oldest frame is a delta: fold the dropped keyframe into it
+            base = bytearray(old[1])
+            nxt = self.frames[0]
+            for off, piece in nxt[2]:
+                base[off:off + len(piece)] = piece
+            self.bytes_used -= _frame_bytes(nxt)
+            self.frames[0] = (nxt[0], bytes(base), None)
+            self.bytes_used += len(base)
+
+    def snapshot_at(self, tick):
+        """Rebuild the snapshot bytes recorded at `tick` (clamped to what is still buffered)."""
+        if not self.frames:
+            return None
+        first = self.frames[0][0]
+        index = max(0, min(len(self.frames) - 1, tick - first))
+        start = index
+        while self.frames[start][1] is None:
+            start -= 1
+        data = bytearray(self.frames[start][1])
+        for i in range(start + 1, index + 1):
+            for off, piece in self.frames[i][2]:
+                data[off:off + len(piece)] = piece
+        return bytes(data), self.frames[index][0]
+
+    def restore(self, game, tick):
+        """Load the state recorded at `tick` into game and forget everything after it."""
+        found = self.snapshot_at(tick)
+        if found is None:
+            return None
+        data, tick = found
+        load_snapshot(game, data)
+        while self.frames and self.frames[-1][0] > tick:
+            self.bytes_used -= _frame_bytes(self.frames.pop())
+        self._prev = data
+        self.tick = tick + 1
+        self._since_key = self.keyframe_every  # next record starts a fresh keyframe
+        return tick
+
+
+def bench(seconds=10.0):
+    import random
+    from benchmark import bench_games
+    from game import FPS
+
+    frames = int(seconds * FPS)
+    with bench_games('rewind') as scratch:
+        def run(buffer):
+            random.seed(11)
+            game = scratch.game(headless=True)
+            game.start_game_with_difficulty('easy')
+            total = 0.0
+            for _ in range(frames):
+                if game.show_question:
+                    game.answer_question(0)
+                if game.state != 'playing':
+                    game.start_game_with_difficulty('easy')
+                game.paddle_target = game.balls[0].pos.x if game.balls else 450
+                t0 = time.perf_counter()
+                game.update(1 / FPS)
+                if buffer is not None:
+                    buffer.record(game)
+                total += time.perf_counter() - t0
+            return game, total / frames
+
+        _, plain = run(None)
+        buffer = RewindBuffer(seconds=5.0, fps=FPS)
+        game, recorded = run(buffer)
+        t0 = time.perf_counter()
+        for back in range(0, len(buffer), 7):
+            buffer.snapshot_at(buffer.tick - 1 - back)
+        lookups = len(range(0, len(buffer), 7))
+        restore_ms = (time.perf_counter() - t0) / lookups * 1e3
+        print(f'update():           {plain * 1e6:8.1f} us/frame')
+        print(f'update() + record:  {recorded * 1e6:8.1f} us/frame  (+{(recorded - plain) * 1e6:.1f} us)')
+        print(f'buffer: {len(buffer)} frames, {buffer.bytes_used / 1024:.1f} KiB '
+              f'(cap {buffer.max_bytes / 1024:.0f} KiB), rebuild {restore_ms:.3f} ms')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
@@ -0,0 +1,400 @@
+"""Classroom server: many headless PhysiBreak sessions in one process.
+
+Each connected student gets a server-side PhysiBreakGame. Clients talk
+newline-delimited JSON over TCP:
+
+    -> {"op": "join", "player": "Ana", "difficulty": "normal"}
+    -> {"op": "input", "x": 412}           paddle target in game coordinates
+    -> {"op": "answer", "choice": 1}
+    -> {"op": "start", "difficulty": "hard"}
+    <- {"op": "level", ...}                block layout, sent when it changes
+    <- {"op": "state", ...}                every STATE_EVERY ticks
+
+Teacher dashboards send {"op": "watch"} instead of join. After the
+{"op": "watching"} reply the connection carries binary statestream frames,
+each prefixed by u32 length and u16 session id (length 0: session ended).
+
+Malformed messages are ignored; a join or start naming an unknown difficulty
+gets {"op": "error", ...} back instead.
+
+All sessions are stepped by one 60 Hz tick loop. Sessions run in round-robin
+order; when a tick runs out of budget the sessions that were not reached go
+first on the next tick, so an overloaded server slows everyone evenly.
+
+    python server.py --port 8765
+    python server.py --loadtest            # most sessions one core holds at 60 Hz
+"""
+import argparse
+import asyncio
+import collections
+import json
+import math
+import random
+import struct
+import sys
+import time
+import traceback
+
+from game import FPS, PROGRESS_DB, TELEMETRY_DIR, TELEMETRY_SAMPLE_RATES, PhysiBreakGame, SpecialBlock
+from progress import ProgressStore
+from statestream import StreamEncoder
+from telemetry import Telemetry, TelemetryChannel
+
+TICK = 1.0 / FPS
+TICK_BUDGET = 0.9 * TICK   # leave room for socket I/O inside each tick
+STATE_EVERY = 2            # send state at 30 Hz
+STREAM_EVERY = 2           # dashboard frames at 30 Hz
+MAX_WRITE_BUFFER = 64 * 1024  # stop sending to clients that do not keep up
+_FRAME = struct.Struct('!IH')  # dashboard frame prefix: length, session id
+DIFFICULTIES = ('easy', 'normal', 'hard')
+MAX_NAME = 40  # characters of a player name kept
+
+
+def layout_message(game):
+    blocks = [[b.rect.x, b.rect.y, b.rect.w, b.rect.h, int(isinstance(b, SpecialBlock))] for b in game.blocks]
+    return {'op': 'level', 'level': game.level, 'blocks': blocks}
+
+
+def state_message(game, tick):
+    alive = 0
+    for i, block in enumerate(game.blocks):
+        if block.alive:
+            alive |= 1 << i
+    question = None
+    if game.show_question and game.current_question:
+        q = game.current_question
+        question = {'id': q['id'], 'prompt': q['prompt'], 'choices': q['choices']}
+    return {
+        'op': 'state',
+        'tick': tick,
+        'state': game.state,
+        'score': game.score,
+        'lives': game.lives,
+        'level': game.level,
+        'paddle': [round(game.paddle.x, 1), game.paddle.width],
+        'balls': [[round(b.pos.x, 1), round(b.pos.y, 1)] for b in game.balls],
+        'alive': format(alive, 'x'),
+        'powerups': [[entry[0].name, round(entry[1], 1)] for entry in game.active_powerups],
+        'question': question,
+    }
+
+
+def _number(value):
+    """value as a finite float, or None for anything else a client sent."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    try:
+        value = float(value)
+    except OverflowError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+class Session:
+    def __init__(self, sid, game, writer=None):
+        self.sid = sid
+        self.game = game
+        self.writer = writer
+        self.ticks = 0
+        self.missed = 0
+        self.layout = None  # the blocks list last sent to the client
+        self.encoder = None  # dashboard stream, created when someone watches
+
+    def send(self, msg):
+        if self.writer is None or self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            return  # slow client: drop frames rather than buffer without bound
+        self.writer.write(json.dumps(msg, separators=(',', ':')).encode() + b'\n')
+
+
+class Watcher:
+    def __init__(self, writer):
+        self.writer = writer
+        self.synced = set()  # session ids this viewer has a keyframe for
+
+    def send(self, sid, frame):
+        if self.writer.is_closing():
+            return False
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.synced.discard(sid)  # a dropped delta breaks the chain; resync with a keyframe
+            return False
+        self.writer.write(_FRAME.pack(len(frame), sid) + frame)
+        return True
+
+
+class ClassroomServer:
+    def __init__(self, host='127.0.0.1', port=8765, progress=None, telemetry=None):
+        self.host = host
+        self.port = port
+        # one store and one writer thread for every session; the ones made here are closed by close()
+        self._owned = []
+        if progress is None:
+            progress = ProgressStore(PROGRESS_DB)
+            self._owned.append(progress)
+        if telemetry is None:
+            telemetry = Telemetry(TELEMETRY_DIR, sample_rates=TELEMETRY_SAMPLE_RATES)
+            self._owned.append(telemetry)
+        self.progress = progress
+        self.telemetry = telemetry
+        self.sessions = {}
+        self.order = collections.deque()  # round-robin tick order
+        self.watchers = []
+        self.tick_count = 0
+        self.last_processed = 0
+        self.tick_times = collections.deque(maxlen=600)
+        self._next_sid = 1
+
+    def add_session(self, writer=None, player='Player', difficulty='normal'):
+        game = PhysiBreakGame(headless=True, progress=self.progress, telemetry=TelemetryChannel(self.telemetry))
+        game.player_name = player
+        game.start_game_with_difficulty(difficulty)
+        session = Session(self._next_sid, game, writer)
+        self._next_sid += 1
+        self.sessions[session.sid] = session
+        self.order.append(session)
+        return session
+
+    def remove_session(self, session):
+        session.game.end_session()
+        self.sessions.pop(session.sid, None)
+        try:
+            self.order.remove(session)
+        except ValueError:
+            pass
+        for watcher in self.watchers:
+            if session.sid in watcher.synced:
+                watcher.synced.discard(session.sid)
+                watcher.send(session.sid, b'')
+
+    def close(self):
+        for session in list(self.order):
+            self.remove_session(session)
+        for owned in self._owned:
+            owned.close()
+        self._owned = []
+
+    def stream(self):
+        if not self.watchers:
+            return
+        tick = self.tick_count
+        for session in self.order:
+            if session.encoder is None:
+                session.encoder = StreamEncoder()
+            frame = session.encoder.encode(session.game, tick)
+            keyframe = frame if frame[:1] == b'K' else None
+            for watcher in self.watchers:
+                if session.sid in watcher.synced:
+                    watcher.send(session.sid, frame)
+                    continue
+                # new viewer (or one that dropped a frame): name, then a keyframe of this same state
+                if keyframe is None:
+                    keyframe = session.encoder.current_keyframe(tick)
+                if watcher.send(session.sid, session.encoder.player(session.game.player_name, tick)):
+                    if watcher.send(session.sid, keyframe):
+                        watcher.synced.add(session.sid)
+
+    def tick(self):
+        start = time.perf_counter()
+        processed = 0
+        send_state = self.tick_count % STATE_EVERY == 0
+        broken = []
+        for session in self.order:
+            if processed and time.perf_counter() - start > TICK_BUDGET:
+                break
+            game = session.game
+            if game.state == 'playing':
+                try:
+                    game.update(TICK)
+                except Exception:
+                    # one broken session must not stop the whole classroom
+                    traceback.print_exc()
+                    broken.append(session)
+            session.ticks += 1
+            processed += 1
+            if session.writer is not None:
+                if session.layout is not game.blocks:
+                    session.layout = game.blocks
+                    session.send(layout_message(game))
+                if send_state:
+                    session.send(state_message(game, self.tick_count))
+        for session in list(self.order)[processed:]:
+            session.missed += 1
+        # whoever was skipped goes first next tick
+        self.order.rotate(-processed)
+        self.last_processed = processed
+        self.tick_count += 1
+        for session in broken:
+            self.remove_session(session)
+            if session.writer is not None:
+                session.writer.close()
+        if self.tick_count % STREAM_EVERY == 0:
+            self.stream()
+        elapsed = time.perf_counter() - start
+        self.tick_times.append(elapsed)
+        return elapsed
+
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            self.tick()
+            next_tick += TICK
+            delay = next_tick - loop.time()
+            if delay < -TICK:
+                next_tick = loop.time()  # fell far behind; do not try to burst-catch-up
+            await asyncio.sleep(max(0.0, delay))
+
+    async def _handle_client(self, reader, writer):
+        session = None
+        watcher = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    break  # a line longer than the stream limit
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(msg, dict):
+                    continue
+                op = msg.get('op')
+                if op == 'watch' and session is None and watcher is None:
+                    writer.write(b'{"op":"watching"}\n')
+                    watcher = Watcher(writer)
+                    self.watchers.append(watcher)
+                elif op == 'join' and session is None and watcher is None:
+                    difficulty = msg.get('difficulty', 'normal')
+                    if difficulty not in DIFFICULTIES:
+                        writer.write(b'{"op":"error","error":"unknown difficulty"}\n')
+                        continue
+                    session = self.add_session(writer, str(msg.get('player', 'Player'))[:MAX_NAME], difficulty)
+                    session.send({'op': 'joined', 'session': session.sid})
+                elif session is None:
+                    continue
+                elif op == 'input':
+                    x = _number(msg.get('x'))
+                    if x is not None:
+                        session.game.paddle_target = x  # Paddle.update clamps it to the field
+                elif op == 'answer':
+                    game = session.game
+                    choice = msg.get('choice')
+                    if (game.show_question and game.current_question and type(choice) is int
+                            and 0 <= choice < len(game.current_question['choices'])):
+                        game.answer_question(choice)
+                elif op == 'start':
+                    difficulty = msg.get('difficulty', 'normal')
+                    if difficulty not in DIFFICULTIES:
+                        session.send({'op': 'error', 'error': 'unknown difficulty'})
+                        continue
+                    session.game.start_game_with_difficulty(difficulty)
+                elif op == 'leave':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if session is not None:
+                self.remove_session(session)
+            if watcher is not None:
+                self.watchers.remove(watcher)
+            writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        ticker = asyncio.create_task(self._tick_loop())
+        print(f'PhysiBreak classroom server on {self.host}:{self.port}')
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ticker.cancel()
+
+
+# ------------------------
+# Load test
+# ------------------------
+def _bot_step(game, rng):
+    if game.state == 'game_over':
+        game.start_game_with_difficulty('normal')
+    if game.show_question and game.current_question:
+        game.answer_question(rng.randrange(len(game.current_question['choices'])))
+    # track the lowest ball with some slop so games last and still lose lives
+    ball = max(game.balls, key=lambda b: b.pos.y)
+    game.paddle_target = ball.pos.x + rng.uniform(-40, 40)
+
+
+def load_test(counts=(25, 50, 100, 200, 400, 800), seconds=2.0):
+    """Step N sessions at full speed (plus state encoding); returns the largest N that held 60 Hz."""
+    from benchmark import bench_games
+
+    rng = random.Random(1)
+    held = failed = 0
+    print(f'{"sessions":>8} {"p50 ms":>8} {"p95 ms":>8} {"us/session":>11} {"skipped":>8}  60 Hz')
+    with bench_games('loadtest') as scratch:
+        server = ClassroomServer(progress=scratch.progress, telemetry=scratch.telemetry())
+        for n in counts:
+            while len(server.order) < n:
+                server.add_session()
+            times = []
+            costs = []
+            skipped = 0
+            frames = int(seconds * FPS)
+            for _ in range(frames):
+                for session in server.order:
+                    _bot_step(session.game, rng)
+                t0 = time.perf_counter()
+                server.tick()
+                processed = server.last_processed
+                if server.tick_count % STATE_EVERY == 0:
+                    for session in list(server.order)[-processed:]:
+                        json.dumps(state_message(session.game, server.tick_count))
+                elapsed = time.perf_counter() - t0
+                times.append(elapsed)
+                costs.append(elapsed / processed)
+                skipped += n - processed
+            times.sort()
+            costs.sort()
+            p50 = times[len(times) // 2]
+            p95 = times[int(len(times) * 0.95)]
+            cost = costs[len(costs) // 2]
+            ok = p95 <= TICK and not skipped
+            print(f'{n:>8} {p50 * 1e3:>8.2f} {p95 * 1e3:>8.2f} {cost * 1e6:>11.1f} '
+                  f'{skipped / (n * frames):>7.0%}  {"yes" if ok else "NO"}')
+            if not ok:
+                failed = n
+                break
+            held = n
+    if held:
+        print(f'held {FPS} Hz with up to {held} sessions on one core' + (f', not with {failed}' if failed else ''))
+    else:
+        print(f'did not hold {FPS} Hz even with {counts[0]} sessions')
+    return held
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='PhysiBreak classroom server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--loadtest', action='store_true', help='find how many sessions one core holds at 60 Hz and exit')
+    parser.add_argument('--seconds', type=float, default=2.0, help='load test duration per step')
+    args = parser.parse_args(argv)
+
+    if args.loadtest:
+        load_test(seconds=args.seconds)
+        return 0
+    server = ClassroomServer(args.host, args.port)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
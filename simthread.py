@@ -0,0 +1,238 @@
+"""Simulation on its own thread, rendering on the main one.
+
+In the plain loop a slow draw() (a long lesson page, a screen full of blocks)
+delays the next update() and the next look at the input. With run_threaded()
+the simulation ticks on a background thread at a fixed rate and, after every
+tick, publishes a RenderState: tuples and numbers copied out of the game,
+never modified afterwards. There are two of them in flight: the one the
+renderer is drawing and the one the simulation is building; publishing is a
+single reference swap, so neither side waits for the other.
+
+The main thread pumps events and draws the latest published state. Event
+handling changes game state (menus, answers, rewind), so it holds the same
+lock the simulation holds during a tick; drawing holds nothing.
+
+TickJitter records how far the spacing of physics ticks strays from the
+nominal step. LatencyProbe records input-to-photon latency: the time from an
+input (PhysiBreakGame.note_input) to the flip of the first frame whose tick
+had seen it.
+
+    python simthread.py --bench     # jitter and latency, single-threaded vs threaded, with and without render load
+"""
+import collections
+import random
+import statistics
+import sys
+import threading
+import time
+
+MAX_LAG = 5  # ticks the simulation may fall behind before it gives up catching up
+SWITCH_INTERVAL = 0.001  # GIL hand-over interval while the simulation thread runs (CPython default 0.005)
+
+
+class TickJitter:
+    def __init__(self, step, keep=3600):
+        self.step = step
+        self.intervals = collections.deque(maxlen=keep)
+        self._last = None
+
+    def tick(self, now):
+        if self._last is not None:
+            self.intervals.append(now - self._last)
+        self._last = now
+
+    def stats(self):
+        if not self.intervals:
+            return {'ticks': 0}
+        off = sorted(abs(i - self.step) for i in self.intervals)
+        return {
+            'ticks': len(self.intervals) + 1,
+            'mean_ms': round(statistics.fmean(self.intervals) * 1e3, 3),
+            'stdev_ms': round(statistics.pstdev(self.intervals) * 1e3, 3),
+            'p99_off_ms': round(off[int(len(off) * 0.99)] * 1e3, 3),
+            'max_off_ms': round(off[-1] * 1e3, 3),
+        }
+
+
+class LatencyProbe:
+    def __init__(self, keep=3600):
+        self.samples = collections.deque(maxlen=keep)
+        self._seen = 0
+
+    def presented(self, view, now):
+        """Call right after the flip that put `view` on screen."""
+        seq, at = view.input_mark
+        if seq != self._seen:
+            self._seen = seq
+            self.samples.append(now - at)
+
+    def stats(self):
+        if not self.samples:
+            return {'inputs': 0}
+        ordered = sorted(self.samples)
+        return {
+            'inputs': len(ordered),
+            'mean_ms': round(statistics.fmean(ordered) * 1e3, 3),
+            'p95_ms': round(ordered[int(len(ordered) * 0.95)] * 1e3, 3),
+            'max_ms': round(ordered[-1] * 1e3, 3),
+        }
+
+
+class SimThread(threading.Thread):
+    def __init__(self, game, rate):
+        super().__init__(name='physibreak-sim', daemon=True)
+        self.game = game
+        self.step = 1.0 / rate
+        self.lock = threading.Lock()  # held for a tick, and by the main thread while it handles events
+        self.running = True
+        self.front = game.render_state()  # latest published state; replaced, never modified
+        self.published = threading.Event()  # set whenever `front` is replaced
+        self.jitter = TickJitter(self.step)
+
+    def run(self):
+        game = self.game
+        step = self.step
+        next_tick = time.perf_counter()
+        while True:
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with self.lock:
+                if not self.running:
+                    return
+                started = time.perf_counter()
+                game.update(step)
+                view = game.render_state()
+            self.front = view
+            self.published.set()
+            self.jitter.tick(started)
+            next_tick += step
+            if started - next_tick > MAX_LAG * step:
+                next_tick = started  # suspended or stalled for a while: resume instead of fast-forwarding
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+
+
+def _draw(game, view, load):
+    game.draw(view)
+    if load:
+        # benchmark render load: keep redrawing the same frame for `load` seconds
+        until = time.perf_counter() + load
+        while time.perf_counter() < until:
+            game.draw(view)
+
+
+def run_threaded(game, rate, frames=None, render_load=0.0, probe=None):
+    """Drive `game` with the simulation on a SimThread; returns the thread once `frames` have been drawn.
+
+    Frames are drawn as ticks are published rather than on a clock of their
+    own, so a new state waits for at most the rest of the frame being drawn.
+    """
+    sim = SimThread(game, rate)
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(SWITCH_INTERVAL)
+    sim.start()
+    drawn = 0
+    try:
+        while frames is None or drawn < frames:
+            sim.published.wait(2 * sim.step)
+            sim.published.clear()
+            started = time.perf_counter()
+            with sim.lock:
+                try:
+                    game.handle_events()
+                except SystemExit:
+                    sim.running = False  # quit_game() has closed what the next tick would write to
+                    raise
+            view = sim.front
+            _draw(game, view, render_load)
+            game.display.present()
+            if probe is not None:
+                probe.presented(view, time.perf_counter())
+            game.gc_policy.end_frame(view.playing)
+            spent = time.perf_counter() - started
+            with sim.lock:
+                # a tier change emits telemetry (one producer at a time on its ring) and retunes the particles
+                game.quality.end_frame(game, spent)
+            if game.profiler is not None:
+                game.profiler.end_frame(game)  # cProfile sees this thread only; the sampler sees both
+            drawn += 1
+    finally:
+        sim.stop()
+        sim.join()
+        sys.setswitchinterval(switch)
+    return sim
+
+
+def run_single(game, rate, frames, render_load=0.0, probe=None):
+    """The plain loop of PhysiBreakGame.run(), instrumented like run_threaded()."""
+    jitter = TickJitter(1.0 / rate)
+    for _ in range(frames):
+        dt = game.clock.tick(rate) / 1000.0
+        game.handle_events()
+        jitter.tick(time.perf_counter())
+        game.update(dt)
+        view = game.render_state()
+        _draw(game, view, render_load)
+        game.display.present()
+        if probe is not None:
+            probe.presented(view, time.perf_counter())
+        game.gc_policy.end_frame(view.playing)
+    return jitter
+
+
+def bench(seconds=10.0, heavy=0.025):
+    """Steer the paddle from a separate 'input' thread; the heavy runs spend `heavy` extra seconds drawing each frame."""
+    import pygame
+    from benchmark import bench_games
+    from game import FPS
+
+    frames = int(seconds * FPS)
+
+    def drive(game, done):
+        # an input every 20-60 ms, at moments unrelated to either loop's schedule; questions are
+        # answered through the event queue, so only the main thread ever changes game state
+        rng = random.Random(4)
+        while not done.is_set():
+            time.sleep(rng.uniform(0.02, 0.06))
+            if game.show_question:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode='a', scancode=4))
+            game.paddle_target = rng.uniform(100, 800)
+            game.note_input()
+
+    with bench_games('sim') as games:
+        for load in (0.0, heavy):
+            for threaded in (False, True):
+                random.seed(2)
+                game = games.game(log='tel', gc_mode='measure')
+                game.starting_lives = 1000  # never game over: every frame is play, a question or a countdown
+                game.start_game_with_difficulty('normal')
+                probe = LatencyProbe()
+                done = threading.Event()
+                driver = threading.Thread(target=drive, args=(game, done), daemon=True)
+                driver.start()
+                started = time.perf_counter()
+                if threaded:
+                    jitter = run_threaded(game, FPS, frames, render_load=load, probe=probe).jitter
+                else:
+                    jitter = run_single(game, FPS, frames, render_load=load, probe=probe)
+                wall = time.perf_counter() - started
+                done.set()
+                driver.join()
+                game.gc_policy.close()
+                game.end_session()
+                game.telemetry.close()
+                j, lat = jitter.stats(), probe.stats()
+                label = f'{"threaded" if threaded else "single"}, {f"+{load * 1e3:.0f} ms draw" if load else "plain draw"}'
+                print(f'{label:>20}: {frames / wall:5.1f} fps, {j["ticks"] / wall:5.1f} ticks/s, '
+                      f'tick jitter stdev {j["stdev_ms"]:.2f} ms (p99 {j["p99_off_ms"]:.2f}, max {j["max_off_ms"]:.2f}), '
+                      f'input-to-photon mean {lat["mean_ms"]:.1f} ms (p95 {lat["p95_ms"]:.1f}, max {lat["max_ms"]:.1f})')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
@@ -0,0 +1,392 @@
+"""Versioned binary save/load of a running PhysiBreakGame.
+
+A snapshot holds everything needed to resume exactly where play stopped:
+paddle (including widen/shrink changes), balls, the block grid, timed
+power-ups with their expiry times and the balls / blocks they own, the
+modifier stacks behind ball speed, paddle width and score, laser bolts and
+falling capsules, the pending question, the seed later levels are generated
+from, the scroll position of a streamed level file and the global RNG state.
+Both directions are plain struct packing and take well under a millisecond,
+so the game can autosave every few seconds.
+
+    python snapshot.py --bench     # save/load timings on a mid-game state
+"""
+import math
+import os
+import random
+import struct
+import sys
+import threading
+import time
+
+MAGIC = b'PBSV'
+VERSION = 6
+
+STATES = ['menu', 'difficulty_select', 'playing', 'game_over', 'lessons']
+DIFFICULTIES = ['easy', 'normal', 'hard']
+
+_HEADER = struct.Struct('<4sH')
+_GAME = struct.Struct('<IqhhBBddddbiI')
+_PADDLE = struct.Struct('<ddiid')
+_BALL = struct.Struct('<ddddHd')
+_BLOCK = struct.Struct('<hhHHhBBBBi')
+_POWERUP = struct.Struct('<BddB')
+_ATTR = struct.Struct('<d')
+_COUNT8 = struct.Struct('<B')
+_COUNT16 = struct.Struct('<H')
+_INDEX = struct.Struct('<h')
+_RNG = struct.Struct('<625IBd')
+_STREAM = struct.Struct('<iid')
+_MOD = struct.Struct('<hdd')  # owner (power-up index, -1 = tag follows), add, mul
+_SHOT = struct.Struct('<ddd')
+_CAPSULE = struct.Struct('<dddi')  # x, y, vy, value
+
+MODIFIER_STACKS = ['ball_speed_mods', 'paddle_width_mods', 'score_mods', 'capsule_mods']
+
+FLAG_SHOW_QUESTION = 1
+FLAG_COUNTDOWN = 2
+FLAG_SHIELD = 4
+FLAG_PAUSED = 8
+
+BLOCK_ALIVE = 1
+BLOCK_SPECIAL = 2
+BLOCK_FROZEN = 4
+
+_write_lock = threading.Lock()
+
+
+def _module(game):
+    # use the classes the game itself was built from, even when it runs as __main__
+    return sys.modules[type(game).__module__]
+
+
+def _pack_str(text):
+    data = text.encode('utf-8')[:65535]
+    return _COUNT16.pack(len(data)) + data
+
+
+def _unpack_str(data, off):
+    (n,) = _COUNT16.unpack_from(data, off)
+    off += 2
+    return bytes(data[off:off + n]).decode('utf-8'), off + n
+
+
+def _pack_ball(ball):
+    return _BALL.pack(ball.pos.x, ball.pos.y, ball.vel.x, ball.vel.y, ball.radius, ball.speed)
+
+
+def save_snapshot(game):
+    mod = _module(game)
+    flags = ((FLAG_SHOW_QUESTION if game.show_question else 0)
+             | (FLAG_COUNTDOWN if game.countdown_active else 0)
+             | (FLAG_SHIELD if game.shield_active else 0)
+             | (FLAG_PAUSED if game.paused else 0))
+    question = game.current_question['id'] if game.current_question else -1
+    difficulty = getattr(game, 'difficulty', None)
+    parts = [
+        _HEADER.pack(MAGIC, VERSION),
+        _GAME.pack(game.level, game.score, game.lives, getattr(game, 'starting_lives', 3),
+                   STATES.index(game.state) if game.state in STATES else 255, flags,
+                   game.score_multiplier, getattr(game, 'ball_speed', mod.BALL_SPEED),
+                   getattr(game, 'paddle_width', mod.PADDLE_WIDTH), game.countdown_time_left,
+                   DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else -1, question,
+                   getattr(game, 'level_seed', 0)),
+        _PADDLE.pack(game.paddle.x, game.paddle.y, game.paddle.width, game.paddle.height, game.paddle.speed),
+    ]
+
+    balls = game.balls
+    parts.append(_COUNT16.pack(len(balls)))
+    parts.extend(_pack_ball(b) for b in balls)
+    # game.ball can outlive its place in game.balls; keep it either way
+    if game.ball in balls:
+        parts.append(_INDEX.pack(balls.index(game.ball)))
+    else:
+        parts.append(_INDEX.pack(-1))
+        parts.append(_pack_ball(game.ball))
+
+    block_struct = _BLOCK.pack
+    special_cls = mod.SpecialBlock
+    parts.append(_COUNT16.pack(len(game.blocks)))
+    for b in game.blocks:
+        r = b.rect
+        special = isinstance(b, special_cls)
+        bflags = ((BLOCK_ALIVE if b.alive else 0) | (BLOCK_SPECIAL if special else 0)
+                  | (BLOCK_FROZEN if getattr(b, 'frozen', False) else 0))
+        parts.append(block_struct(r.x, r.y, r.w, r.h, b.hits, b.color[0], b.color[1], b.color[2], bflags,
+                                  b.question_id if special else -1))
+
+    kinds = mod.powerup_classes
+    timers = game.active_powerups
+    entries = timers.entries()
+    block_index = None
+    parts.append(_ATTR.pack(timers.now) + _COUNT8.pack(len(entries)))
+    for pu, expires in entries:
+        attrs = [(k, v) for k, v in vars(pu).items()
+                 if k not in ('name', 'duration') and isinstance(v, (int, float)) and not isinstance(v, bool)]
+        duration = float('nan') if pu.duration is None else pu.duration
+        parts.append(_POWERUP.pack(kinds.index(type(pu)), expires, duration, len(attrs)))
+        for key, value in attrs:
+            parts.append(_pack_str(key) + _ATTR.pack(value))
+        # ownership is kept as indices into game.balls / game.blocks
+        owned = [balls.index(b) for b in pu.owned_balls if b in balls]
+        parts.append(_COUNT16.pack(len(owned)) + b''.join(_COUNT16.pack(i) for i in owned))
+        if pu.owned_blocks and block_index is None:
+            block_index = {id(b): i for i, b in enumerate(game.blocks)}
+        owned = [block_index[id(b)] for b in pu.owned_blocks if id(b) in block_index] if pu.owned_blocks else []
+        parts.append(_COUNT16.pack(len(owned)) + b''.join(_COUNT16.pack(i) for i in owned))
+
+    owners = {id(pu): i for i, (pu, _) in enumerate(entries)}
+    for attr in MODIFIER_STACKS:
+        stack = getattr(game, attr)
+        parts.append(_ATTR.pack(stack.base) + _COUNT8.pack(len(stack.mods)))
+        for owner, add, mul in stack.mods:
+            index = owners.get(id(owner), -1)
+            parts.append(_MOD.pack(index, add, mul))
+            if index < 0:
+                parts.append(_pack_str(owner if isinstance(owner, str) else getattr(owner, 'name', '')))
+
+    shots = game.projectiles.active
+    parts.append(_COUNT16.pack(len(shots)))
+    parts.extend(_SHOT.pack(p.x, p.y, p.vy) for p in shots)
+    capsules = game.capsules.active
+    parts.append(_COUNT16.pack(len(capsules)))
+    parts.extend(_CAPSULE.pack(c.x, c.y, c.vy, c.value) for c in capsules)
+
+    parts.append(_pack_str(game.feedback_message or ''))
+
+    stream = getattr(game, 'level_stream', None)
+    if stream is None:
+        parts.append(_pack_str(''))
+    else:
+        parts.append(_pack_str(stream.map.path) + _STREAM.pack(stream.next_row, stream.shifted, stream.scroll))
+
+    _, internal, gauss = random.getstate()
+    parts.append(_RNG.pack(*internal, gauss is not None, gauss or 0.0))
+    return b''.join(parts)
+
+
+def _pooled_ball(game, fields):
+    x, y, vx, vy, radius, speed = fields
+    ball = game.ball_pool.acquire()  # no reset(): that would draw a random angle
+    ball.pos.x, ball.pos.y = x, y
+    ball.vel.x, ball.vel.y = vx, vy
+    ball.radius = radius
+    ball.speed = speed
+    return ball
+
+
+def load_snapshot(game, data):
+    mod = _module(game)
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError('not a PhysiBreak snapshot')
+    if version != VERSION:
+        raise ValueError(f'unsupported snapshot version {version} (expected {VERSION})')
+    off = _HEADER.size
+
+    (level, score, lives, starting_lives, state, flags, score_multiplier, ball_speed, paddle_width,
+     countdown_left, difficulty, question, level_seed) = _GAME.unpack_from(data, off)
+    off += _GAME.size
+    px, py, pw, ph, pspeed = _PADDLE.unpack_from(data, off)
+    off += _PADDLE.size
+
+    (n,) = _COUNT16.unpack_from(data, off)
+    off += 2
+    # balls come out of the game's pool, so they are only built once parsing succeeded
+    ball_fields = []
+    for _ in range(n):
+        ball_fields.append(_BALL.unpack_from(data, off))
+        off += _BALL.size
+    (ball_index,) = _INDEX.unpack_from(data, off)
+    off += 2
+    main_fields = None
+    if ball_index < 0:
+        main_fields = _BALL.unpack_from(data, off)
+        off += _BALL.size
+
+    (n,) = _COUNT16.unpack_from(data, off)
+    off += 2
+    blocks = []
+    for _ in range(n):
+        x, y, w, h, hits, cr, cg, cb, bflags, qid = _BLOCK.unpack_from(data, off)
+        off += _BLOCK.size
+        if bflags & BLOCK_SPECIAL:
+            b = mod.SpecialBlock(x, y, w, h, qid, color=(cr, cg, cb))
+            b.frozen = bool(bflags & BLOCK_FROZEN)
+        else:
+            b = mod.Block(x, y, w, h, hits=hits, color=(cr, cg, cb))
+        b.hits = hits
+        b.alive = bool(bflags & BLOCK_ALIVE)
+        blocks.append(b)
+
+    (now,) = _ATTR.unpack_from(data, off)
+    (n,) = _COUNT8.unpack_from(data, off + _ATTR.size)
+    off += _ATTR.size + 1
+    timers = mod.PowerUpTimers(now)
+    loaded = []
+    for _ in range(n):
+        kind, expires, duration, nattrs = _POWERUP.unpack_from(data, off)
+        off += _POWERUP.size
+        pu = mod.powerup_classes[kind]()
+        pu.duration = None if math.isnan(duration) else duration
+        for _ in range(nattrs):
+            key, off = _unpack_str(data, off)
+            (value,) = _ATTR.unpack_from(data, off)
+            off += _ATTR.size
+            setattr(pu, key, int(value) if isinstance(getattr(pu, key, None), int) else value)
+        (count,) = _COUNT16.unpack_from(data, off)
+        pu.owned_balls = [_COUNT16.unpack_from(data, off + 2 + 2 * i)[0] for i in range(count)]  # indices for now
+        off += 2 + 2 * count
+        (count,) = _COUNT16.unpack_from(data, off)
+        pu.owned_blocks = [blocks[_COUNT16.unpack_from(data, off + 2 + 2 * i)[0]] for i in range(count)]
+        off += 2 + 2 * count
+        timers.restore(pu, expires)
+        loaded.append(pu)
+
+    stacks = []
+    for attr in MODIFIER_STACKS:
+        (base,) = _ATTR.unpack_from(data, off)
+        (count,) = _COUNT8.unpack_from(data, off + _ATTR.size)
+        off += _ATTR.size + 1
+        current = getattr(game, attr)
+        stack = mod.ModifierStack(type(current.base)(base), minimum=current.minimum)
+        for _ in range(count):
+            index, add, mul = _MOD.unpack_from(data, off)
+            off += _MOD.size
+            if index < 0:
+                owner, off = _unpack_str(data, off)
+            else:
+                owner = loaded[index]
+            stack.add(owner, add=add, mul=mul)
+        stack.dirty = False  # balls, paddle and multiplier below already carry these values
+        stacks.append(stack)
+
+    (n,) = _COUNT16.unpack_from(data, off)
+    off += 2
+    shots = []
+    for _ in range(n):
+        shots.append(_SHOT.unpack_from(data, off))
+        off += _SHOT.size
+    (n,) = _COUNT16.unpack_from(data, off)
+    off += 2
+    capsules = []
+    for _ in range(n):
+        capsules.append(_CAPSULE.unpack_from(data, off))
+        off += _CAPSULE.size
+
+    feedback, off = _unpack_str(data, off)
+    level_map, off = _unpack_str(data, off)
+    stream = None
+    if level_map:
+        next_row, shifted, scroll = _STREAM.unpack_from(data, off)
+        off += _STREAM.size
+        current = getattr(game, 'level_map', None)
+        if current is None or current.path != level_map:
+            try:
+                current = mod.LevelMap(level_map)
+            except OSError as e:
+                raise ValueError(f'level file of this snapshot is unavailable: {e}')
+        stream = mod.LevelStream(current, **game.levels.geometry, next_row=next_row, scroll=scroll, shifted=shifted)
+    rng = _RNG.unpack_from(data, off)
+    off += _RNG.size
+
+    # everything parsed; only now touch the game
+    game.level = level
+    game.level_seed = level_seed
+    game.score = score
+    game.lives = lives
+    game.starting_lives = starting_lives
+    game.state = STATES[state] if state < len(STATES) else game.state
+    game.show_question = bool(flags & FLAG_SHOW_QUESTION)
+    game.countdown_active = bool(flags & FLAG_COUNTDOWN)
+    game.shield_active = bool(flags & FLAG_SHIELD)
+    game.paused = bool(flags & FLAG_PAUSED)
+    game.score_multiplier = int(score_multiplier) if score_multiplier.is_integer() else score_multiplier
+    game.ball_speed = ball_speed
+    game.paddle_width = paddle_width
+    game.countdown_time_left = countdown_left
+    if difficulty >= 0:
+        game.difficulty = DIFFICULTIES[difficulty]
+    game.current_question = game.qman.get_question(question) if question >= 0 else None
+    game.paddle = mod.Paddle(px, py, width=pw, height=ph)
+    game.paddle.speed = pspeed
+    game.paddle.update(mod.SCREEN_WIDTH, px)  # sync rect without moving
+    game.ball_pool.release_all()
+    balls = [_pooled_ball(game, fields) for fields in ball_fields]
+    game.balls = balls
+    game.ball = balls[ball_index] if main_fields is None else _pooled_ball(game, main_fields)
+    game.blocks = blocks
+    for pu, _ in timers.entries():
+        pu.owned_balls = [balls[i] for i in pu.owned_balls]
+    game.active_powerups = timers
+    game.projectiles.release_all()
+    for x, y, vy in shots:
+        shot = game.projectiles.acquire()
+        if shot is not None:
+            shot.x, shot.y, shot.vy = x, y, vy
+    game.capsules.release_all()
+    for x, y, vy, value in capsules:
+        capsule = game.capsules.acquire()
+        if capsule is not None:
+            capsule.x, capsule.y, capsule.vy, capsule.value = x, y, vy, value
+    game.feedback_message = feedback
+    for attr, stack in zip(MODIFIER_STACKS, stacks):
+        setattr(game, attr, stack)
+    game.level_stream = stream
+    if stream is not None:
+        game.level_map = stream.map
+    random.setstate((3, tuple(rng[:625]), rng[626] if rng[625] else None))
+    return game
+
+
+def write_snapshot(path, data):
+    tmp = path + '.tmp'
+    with _write_lock:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)  # never leave a half-written save behind
+
+
+def write_snapshot_async(path, data):
+    """Write on a short-lived thread so autosaves never wait on the disk."""
+    t = threading.Thread(target=write_snapshot, args=(path, data), name='autosave', daemon=True)
+    t.start()
+    return t
+
+
+def read_snapshot(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def bench(rounds=2000):
+    from benchmark import bench_game
+    from game import MultiBallPowerUp, SlowBall
+
+    with bench_game('snap', headless=True) as game:
+        game.level = 4
+        game.start_game_with_difficulty('normal')
+        game.level = 4
+        game.generate_level()
+        game.spawn_powerup(MultiBallPowerUp())
+        game.spawn_powerup(SlowBall())
+        for _ in range(120):
+            game.update(1 / 60)
+        data = save_snapshot(game)
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            save_snapshot(game)
+        t1 = time.perf_counter()
+        for _ in range(rounds):
+            load_snapshot(game, data)
+        t2 = time.perf_counter()
+        print(f'{len(game.blocks)} blocks, {len(game.balls)} balls, {len(game.active_powerups)} power-ups: '
+              f'{len(data)} bytes')
+        print(f'save {((t1 - t0) / rounds) * 1e3:.3f} ms   load {((t2 - t1) / rounds) * 1e3:.3f} ms')
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
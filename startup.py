@@ -0,0 +1,142 @@
+"""Cold-start profile and budget.
+
+Measures what it takes to get from a fresh interpreter to the first menu
+frame: imports (per package, from `python -X importtime`), PhysiBreakGame()
+and the first draw. Every measurement runs in a new process, so nothing is
+already imported.
+
+The menu needs only the display and two fonts. The mixer, joysticks,
+question bank, lesson pages and particle arrays are created on first use
+(sounds, joysticks and particles when a game starts), and the check fails if
+any of them is found initialized at the menu.
+
+STARTUP_BUDGET_MS is the target on Raspberry Pi class hardware. On any other
+machine the measured time is multiplied by HOST_SLOWDOWN (roughly how much
+slower a Pi 4 runs this than a desktop) before it is compared with the budget.
+
+    python startup.py --profile          # import time per package and the startup phases
+    python startup.py --bench [runs]     # median cold start against the budget; exits 1 when over
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+STARTUP_BUDGET_MS = 2000.0  # interpreter start to first menu frame, on a Pi 4
+HOST_SLOWDOWN = 4.0
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# run in a fresh interpreter; prints the phase timings as one JSON line
+_CHILD = '''
+import json, os, shutil, sys, tempfile, time
+t0 = time.perf_counter()
+import pygame
+t1 = time.perf_counter()
+import game
+from progress import ProgressStore
+from telemetry import Telemetry
+t2 = time.perf_counter()
+tmp = tempfile.mkdtemp(prefix='physibreak-startup-')
+g = game.PhysiBreakGame(progress=ProgressStore(os.path.join(tmp, 'startup.db')),
+                        telemetry=Telemetry(directory=os.path.join(tmp, 'telemetry')))
+t3 = time.perf_counter()
+g.draw()
+g.display.present()
+t4 = time.perf_counter()
+eager = [name for name, up in (('mixer', pygame.mixer.get_init()), ('joystick', pygame.joystick.get_init()),
+                               ('questions', g._qman is not None), ('lessons', g._lessons is not None),
+                               ('particles', g.particles.np is not None)) if up]
+print(json.dumps({'pygame': t1 - t0, 'game': t2 - t1, 'init': t3 - t2, 'frame': t4 - t3, 'eager': eager}))
+g.progress.close()
+g.telemetry.close()
+shutil.rmtree(tmp, ignore_errors=True)
+'''
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    return env
+
+
+def on_pi():
+    try:
+        with open('/proc/device-tree/model', 'rb') as f:
+            return b'Raspberry Pi' in f.read()
+    except OSError:
+        return False
+
+
+def cold_start():
+    """One fresh process up to the first menu frame: phase times in seconds, plus the wall time."""
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', _CHILD], cwd=HERE, env=_env(),
+                         capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    phases = json.loads(out.stdout.strip().splitlines()[-1])
+    phases['wall'] = wall
+    return phases
+
+
+def import_times():
+    """[(package, self us, own module?)] for `import game`, summed per top-level package."""
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import game'], cwd=HERE, env=_env(),
+                         capture_output=True, text=True, check=True)
+    totals = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        root = name.strip().split('.')[0]
+        totals[root] = totals.get(root, 0) + int(self_us)
+    return sorted(((root, us, os.path.exists(os.path.join(HERE, root + '.py'))) for root, us in totals.items()),
+                  key=lambda row: -row[1])
+
+
+def profile(top=12):
+    rows = import_times()
+    total = sum(us for _, us, _ in rows)
+    print(f'import game: {total / 1e3:.1f} ms (self time per top-level package, * = this repo)')
+    for root, us, own in rows[:top]:
+        print(f'  {"*" if own else " "} {root:<20} {us / 1e3:8.1f} ms')
+    rest = rows[top:]
+    if rest:
+        print(f'    {len(rest)} more{"":<12} {sum(us for _, us, _ in rest) / 1e3:8.1f} ms')
+    phases = cold_start()
+    print(f'phases: import pygame {phases["pygame"] * 1e3:.1f} ms, other imports {phases["game"] * 1e3:.1f} ms, '
+          f'PhysiBreakGame() {phases["init"] * 1e3:.1f} ms, first frame {phases["frame"] * 1e3:.1f} ms, '
+          f'process {phases["wall"] * 1e3:.1f} ms')
+    if phases['eager']:
+        print(f'initialized before first use: {", ".join(phases["eager"])}')
+
+
+def bench(runs=5):
+    starts = [cold_start() for _ in range(runs)]
+    wall = statistics.median(s['wall'] for s in starts) * 1e3
+    slowdown = 1.0 if on_pi() else HOST_SLOWDOWN
+    for key, label in (('pygame', 'import pygame'), ('game', 'other imports'),
+                       ('init', 'PhysiBreakGame()'), ('frame', 'first frame')):
+        print(f'{label:>17}: {statistics.median(s[key] for s in starts) * 1e3:8.1f} ms')
+    print(f'{"cold start":>17}: {wall:8.1f} ms (median of {runs} processes)')
+    estimate = wall * slowdown
+    print(f'{"on a Pi":>17}: {estimate:8.1f} ms{"" if slowdown == 1.0 else f" (x{slowdown:g} estimate)"}, '
+          f'budget {STARTUP_BUDGET_MS:.0f} ms')
+    eager = sorted({name for s in starts for name in s['eager']})
+    if eager:
+        print(f'initialized before first use: {", ".join(eager)}')
+    return estimate <= STARTUP_BUDGET_MS and not eager
+
+
+if __name__ == '__main__':
+    if '--profile' in sys.argv:
+        profile()
+    elif '--bench' in sys.argv:
+        i = sys.argv.index('--bench')
+        runs = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 else 5
+        sys.exit(0 if bench(runs) else 1)
+    else:
+        print(__doc__)
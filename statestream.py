@@ -0,0 +1,331 @@
+"""Compact binary state streaming for teacher dashboards.
+
+StreamEncoder turns a PhysiBreakGame into a stream of small frames: a full
+keyframe (block layout included) every KEYFRAME_EVERY frames or whenever the
+layout changes or a streamed level scrolls it, and per-tick deltas holding
+only the fields that changed in between. StreamDecoder rebuilds a StreamView from those frames.
+
+Frame layout (network byte order):
+    b'K' | b'D' | b'P'   u32 tick   body
+Keyframe body:
+    scalars  paddle  balls  powerups  u16 nblocks  nblocks * block  alive bitmap  frozen bitmap
+Delta body:
+    u16 field mask, then only the fields whose bit is set; block changes are
+    sent as the indices whose alive / frozen bit flipped.
+Player body:
+    utf-8 player name (sent once per viewer, before the first keyframe)
+
+    python statestream.py --bench      # bytes/s and CPU per client, 30 streams
+"""
+import json
+import random
+import struct
+import sys
+import time
+
+KEYFRAME_EVERY = 60
+STATES = ['menu', 'difficulty_select', 'playing', 'game_over', 'lessons']
+
+_HEADER = struct.Struct('!cI')
+_SCALARS = struct.Struct('!BIHHh')     # state, score, lives, level, question id (-1 = none)
+_PADDLE_X = struct.Struct('!h')        # quarter pixels
+_PADDLE_W = struct.Struct('!H')
+_BALL = struct.Struct('!hh')           # quarter pixels
+_POWERUP = struct.Struct('!BH')        # kind, remaining deciseconds
+_BLOCK = struct.Struct('!hhHHB')       # x, y (negative above a streamed level), w, h, special
+_U8 = struct.Struct('!B')
+_U16 = struct.Struct('!H')
+
+F_SCALARS = 1 << 0
+F_PADDLE_X = 1 << 1
+F_PADDLE_W = 1 << 2
+F_BALLS = 1 << 3
+F_POWERUPS = 1 << 4
+F_ALIVE = 1 << 5
+F_FROZEN = 1 << 6
+
+
+def _q(v):
+    return max(-32768, min(32767, int(round(v * 4))))
+
+
+def _powerup_kinds():
+    from game import powerup_classes
+    return {cls.__name__: i for i, cls in enumerate(powerup_classes)}
+
+
+def capture(game, kinds):
+    """Snapshot the dashboard-relevant parts of a game as a tuple of immutables."""
+    alive = frozen = 0
+    for i, block in enumerate(game.blocks):
+        if block.alive:
+            alive |= 1 << i
+        if getattr(block, 'frozen', False):
+            frozen |= 1 << i
+    question = game.current_question['id'] if game.show_question and game.current_question else -1
+    state = STATES.index(game.state) if game.state in STATES else 255
+    return (
+        (state, game.score, game.lives, game.level, question),
+        _q(game.paddle.x),
+        game.paddle.width,
+        tuple((_q(b.pos.x), _q(b.pos.y)) for b in game.balls),
+        tuple((kinds.get(type(entry[0]).__name__, 255), min(65535, int(entry[1] * 10)))
+              for entry in game.active_powerups),
+        game.blocks,
+        alive,
+        frozen,
+        game.level_stream.shifted if game.level_stream is not None else 0,
+    )
+
+
+def _pack_balls(balls):
+    return _U8.pack(len(balls)) + b''.join(_BALL.pack(x, y) for x, y in balls)
+
+
+def _pack_powerups(powerups):
+    return _U8.pack(len(powerups)) + b''.join(_POWERUP.pack(k, r) for k, r in powerups)
+
+
+def _pack_flips(diff):
+    indices = []
+    i = 0
+    while diff:
+        if diff & 1:
+            indices.append(i)
+        diff >>= 1
+        i += 1
+    return _U16.pack(len(indices)) + b''.join(_U16.pack(i) for i in indices)
+
+
+class StreamEncoder:
+    def __init__(self, keyframe_every=KEYFRAME_EVERY):
+        self.keyframe_every = keyframe_every
+        self.kinds = _powerup_kinds()
+        self.prev = None
+        self.since_key = 0
+
+    def keyframe(self, view, tick):
+        scalars, px, pw, balls, powerups, blocks, alive, frozen, _ = view
+        nbytes = (len(blocks) + 7) // 8
+        parts = [_HEADER.pack(b'K', tick), _SCALARS.pack(*scalars), _PADDLE_X.pack(px), _PADDLE_W.pack(pw),
+                 _pack_balls(balls), _pack_powerups(powerups), _U16.pack(len(blocks))]
+        for b in blocks:
+            r = b.rect
+            parts.append(_BLOCK.pack(r.x, r.y, r.w, r.h, int(hasattr(b, 'question_id'))))
+        parts.append(alive.to_bytes(nbytes, 'little'))
+        parts.append(frozen.to_bytes(nbytes, 'little'))
+        return b''.join(parts)
+
+    def delta(self, prev, view, tick):
+        mask = 0
+        parts = []
+        if view[0] != prev[0]:
+            mask |= F_SCALARS
+            parts.append(_SCALARS.pack(*view[0]))
+        if view[1] != prev[1]:
+            mask |= F_PADDLE_X
+            parts.append(_PADDLE_X.pack(view[1]))
+        if view[2] != prev[2]:
+            mask |= F_PADDLE_W
+            parts.append(_PADDLE_W.pack(view[2]))
+        if view[3] != prev[3]:
+            mask |= F_BALLS
+            parts.append(_pack_balls(view[3]))
+        if view[4] != prev[4]:
+            mask |= F_POWERUPS
+            parts.append(_pack_powerups(view[4]))
+        if view[6] != prev[6]:
+            mask |= F_ALIVE
+            parts.append(_pack_flips(view[6] ^ prev[6]))
+        if view[7] != prev[7]:
+            mask |= F_FROZEN
+            parts.append(_pack_flips(view[7] ^ prev[7]))
+        return _HEADER.pack(b'D', tick) + _U16.pack(mask) + b''.join(parts)
+
+    def encode(self, game, tick, force_key=False):
+        view = capture(game, self.kinds)
+        prev = self.prev
+        self.prev = view
+        if (force_key or prev is None or view[5] is not prev[5] or len(view[5]) != len(prev[5])
+                or view[8] != prev[8] or self.since_key >= self.keyframe_every):
+            self.since_key = 0
+            return self.keyframe(view, tick)
+        self.since_key += 1
+        return self.delta(prev, view, tick)
+
+    def player(self, name, tick):
+        return _HEADER.pack(b'P', tick) + name.encode('utf-8')[:255]
+
+    def current_keyframe(self, tick):
+        """Keyframe of the last encoded state, for a viewer joining mid-stream."""
+        return self.keyframe(self.prev, tick) if self.prev is not None else None
+
+
+class StreamView:
+    def __init__(self):
+        self.tick = 0
+        self.player = ''
+        self.state = None
+        self.score = 0
+        self.lives = 0
+        self.level = 0
+        self.question = -1
+        self.paddle_x = 0.0
+        self.paddle_w = 0
+        self.balls = []
+        self.powerups = []
+        self.blocks = []     # [x, y, w, h, special]
+        self.alive = 0       # bitmaps over self.blocks
+        self.frozen = 0
+
+    def block_alive(self, i):
+        return (self.alive >> i) & 1
+
+    def block_frozen(self, i):
+        return (self.frozen >> i) & 1
+
+
+class StreamDecoder:
+    def __init__(self):
+        self.view = StreamView()
+        self.synced = False
+
+    def _scalars(self, data, off):
+        v = self.view
+        state, v.score, v.lives, v.level, v.question = _SCALARS.unpack_from(data, off)
+        v.state = STATES[state] if state < len(STATES) else None
+        return off + _SCALARS.size
+
+    def _balls(self, data, off):
+        (n,) = _U8.unpack_from(data, off)
+        off += 1
+        balls = []
+        for _ in range(n):
+            x, y = _BALL.unpack_from(data, off)
+            balls.append((x / 4, y / 4))
+            off += _BALL.size
+        self.view.balls = balls
+        return off
+
+    def _powerups(self, data, off):
+        (n,) = _U8.unpack_from(data, off)
+        off += 1
+        powerups = []
+        for _ in range(n):
+            kind, rem = _POWERUP.unpack_from(data, off)
+            powerups.append((kind, rem / 10))
+            off += _POWERUP.size
+        self.view.powerups = powerups
+        return off
+
+    def _flips(self, data, off):
+        (n,) = _U16.unpack_from(data, off)
+        off += 2
+        diff = 0
+        for _ in range(n):
+            diff |= 1 << _U16.unpack_from(data, off)[0]
+            off += 2
+        return diff, off
+
+    def apply(self, data):
+        """Apply one frame; returns the view, or None while waiting for the first keyframe."""
+        kind, tick = _HEADER.unpack_from(data, 0)
+        off = _HEADER.size
+        v = self.view
+        if kind == b'K':
+            off = self._scalars(data, off)
+            (px,) = _PADDLE_X.unpack_from(data, off)
+            (v.paddle_w,) = _PADDLE_W.unpack_from(data, off + 2)
+            v.paddle_x = px / 4
+            off = self._powerups(data, self._balls(data, off + 4))
+            (n,) = _U16.unpack_from(data, off)
+            off += 2
+            blocks = []
+            for _ in range(n):
+                blocks.append(list(_BLOCK.unpack_from(data, off)))
+                off += _BLOCK.size
+            v.blocks = blocks
+            nbytes = (n + 7) // 8
+            v.alive = int.from_bytes(data[off:off + nbytes], 'little')
+            v.frozen = int.from_bytes(data[off + nbytes:off + 2 * nbytes], 'little')
+            self.synced = True
+        elif kind == b'D':
+            if not self.synced:
+                return None
+            (mask,) = _U16.unpack_from(data, off)
+            off += 2
+            if mask & F_SCALARS:
+                off = self._scalars(data, off)
+            if mask & F_PADDLE_X:
+                v.paddle_x = _PADDLE_X.unpack_from(data, off)[0] / 4
+                off += 2
+            if mask & F_PADDLE_W:
+                (v.paddle_w,) = _PADDLE_W.unpack_from(data, off)
+                off += 2
+            if mask & F_BALLS:
+                off = self._balls(data, off)
+            if mask & F_POWERUPS:
+                off = self._powerups(data, off)
+            if mask & F_ALIVE:
+                diff, off = self._flips(data, off)
+                v.alive ^= diff
+            if mask & F_FROZEN:
+                diff, off = self._flips(data, off)
+                v.frozen ^= diff
+        elif kind == b'P':
+            v.player = bytes(data[off:]).decode('utf-8', 'replace')
+            return v
+        else:
+            raise ValueError(f'unknown frame type {kind!r}')
+        v.tick = tick
+        return v
+
+
+def bench(streams=30, seconds=10.0, rate=30):
+    """Simulate `streams` bot-driven games and report stream size and encode/decode cost."""
+    from benchmark import bench_games
+    from server import FPS, ClassroomServer, state_message, _bot_step
+
+    rng = random.Random(7)
+    every = max(1, FPS // rate)
+    total_bytes = json_bytes = frames = keyframes = 0
+    encode_time = decode_time = 0.0
+    ticks = int(seconds * FPS)
+    with bench_games('stream') as scratch:
+        server = ClassroomServer(progress=scratch.progress, telemetry=scratch.telemetry())
+        sessions = [server.add_session() for _ in range(streams)]
+        encoders = [StreamEncoder() for _ in sessions]
+        decoders = [StreamDecoder() for _ in sessions]
+        for tick in range(ticks):
+            for s in sessions:
+                _bot_step(s.game, rng)
+            server.tick()
+            if tick % every:
+                continue
+            for s, enc, dec in zip(sessions, encoders, decoders):
+                t0 = time.perf_counter()
+                frame = enc.encode(s.game, tick)
+                t1 = time.perf_counter()
+                dec.apply(frame)
+                decode_time += time.perf_counter() - t1
+                encode_time += t1 - t0
+                total_bytes += len(frame)
+                keyframes += frame[:1] == b'K'
+                frames += 1
+                json_bytes += len(json.dumps(state_message(s.game, tick), separators=(',', ':')))
+    duration = ticks / FPS
+    per_client_bps = total_bytes / duration / streams
+    enc_us = encode_time / frames * 1e6
+    print(f'{streams} streams at {rate} Hz over {duration:.0f}s of play ({keyframes} keyframes of {frames} frames)')
+    print(f'  binary: {per_client_bps / 1024:.2f} KiB/s per client, {per_client_bps * streams / 1024:.1f} KiB/s total')
+    print(f'  json  : {json_bytes / duration / streams / 1024:.2f} KiB/s per client (for comparison)')
+    print(f'  encode: {enc_us:.1f} us/frame = {enc_us * rate / 1e4:.3f}% of a core per client')
+    print(f'  decode: {decode_time / frames * 1e6:.1f} us/frame')
+    return per_client_bps, enc_us
+
+
+if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        bench()
+    else:
+        print(__doc__)
@@ -0,0 +1,42 @@
+import os
+import shutil
+import sys
+import warnings
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame  # noqa: E402
+
+from game import PhysiBreakGame  # noqa: E402
+from progress import ProgressStore  # noqa: E402
+from telemetry import Telemetry  # noqa: E402
+
+
+def test_menu_layer_redrawn_after_suspend(tmp_path, monkeypatch):
+    # the game reads its content and writes autosave.pbs relative to the working directory
+    shutil.copytree(os.path.join(ROOT, 'content'), tmp_path / 'content')
+    monkeypatch.chdir(tmp_path)
+    warnings.simplefilter('ignore')  # 'no fast renderer available' under the dummy driver
+    game = PhysiBreakGame(display_mode='renderer', progress=ProgressStore(str(tmp_path / 'progress.db')),
+                          telemetry=Telemetry(directory=None))
+    try:
+        drawn = []
+        draw_screen = game.draw_screen
+        game.draw_screen = lambda state: (drawn.append(state), draw_screen(state))
+        game.draw()
+        game.draw()
+        assert drawn == ['menu']  # the second frame reuses the uploaded menu
+
+        game.start_game_with_difficulty('normal')
+        game.draw()
+        game.handle_playing_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0))
+        assert game.state == 'menu'
+        assert 'Resume' in [button.text for button in game.menu_buttons]
+        game.draw()
+        assert drawn == ['menu', 'menu']  # the rebuilt buttons are drawn, not the old frame
+    finally:
+        game.progress.close()
+        pygame.display.quit()